@@ -1,40 +1,20 @@
-import requests
 from typing import List, Dict, Optional, Any
 import re
 import asyncio
-import configparser
-from pathlib import Path
+from contextlib import contextmanager
+import aiohttp
 import psycopg2
-from requests.auth import HTTPBasicAuth
-
-
-
-def load_config():
-    config = configparser.ConfigParser()
-    project_config = Path('.github_analyzer_config')
-    if project_config.exists():
-        config.read(project_config)
-        return config
-
-    raise FileNotFoundError("No .github_analyzer_config found in project root or home directory")
-try:
-        config = load_config()
-        GITHUB_TOKEN = config.get('GITHUB', 'TOKEN')
-        DB_CONFIG = {
-            'dbname': config.get('DATABASE', 'NAME'),
-            'user': config.get('DATABASE', 'USER'),
-            'password': config.get('DATABASE', 'PASSWORD'),
-            'host': config.get('DATABASE', 'HOST'),
-            'port': config.get('DATABASE', 'PORT')
-        }
-        jira_config = {
-                'base_url': config.get('JIRA', 'URL'),
-                'email': config.get('JIRA', 'EMAIL'),
-                'token': config.get('JIRA', 'TOKEN')
-            }
-except Exception as e:
-        print(f"Config error: {e}")
-        exit(1)
+from psycopg2.extras import execute_values, NamedTupleCursor
+from psycopg2.pool import ThreadedConnectionPool
+from http_cache import ResponseCache, cache_key, json_loads
+from config import SETTINGS
+
+
+
+GITHUB_TOKEN = SETTINGS.github['token']
+DB_CONFIG = SETTINGS.db_config
+jira_config = SETTINGS.jira
+JIRA_FIELD_NAMES = SETTINGS.jira_field_names
 
 
 BASE_URL = 'https://api.github.com'
@@ -45,182 +25,379 @@ HEADERS = {
 JIRA_EMAIL = jira_config.get('email')
 JIRA_API_TOKEN = jira_config.get('token')
 JIRA_BASE_URL = jira_config.get('base_url')
+# Fallback IDs used when a configured field name is not found on the instance
 TEAM_FIELD_ID = "customfield_10001"
 VENDOR_FIELD_ID = "customfield_10058"
 SPRINT_FIELD_ID = "customfield_10020"
 
-auth = HTTPBasicAuth(JIRA_EMAIL, JIRA_API_TOKEN)
 headers = {"Accept": "application/json"}
-
-def create_db_connection():
+JIRA_PAGE_SIZE = 100
+JIRA_CACHE_PATH = '.jira_cache.sqlite'
+JIRA_CACHE_TTL = 300  # seconds before a cached response is revalidated
+JIRA_FIELD_CACHE_TTL = 86400  # the field catalogue rarely changes
+STREAM_ITERSIZE = 50000  # rows per round-trip for server-side cursors
+ISSUE_QUEUE_SIZE = 200  # fetched issues waiting to be written
+UPSERT_WORKERS = 4
+UPSERT_BATCH_SIZE = 500
+ISSUE_BASE_FIELDS = "status,assignee,reporter"
+
+def create_jira_session() -> aiohttp.ClientSession:
+        """Create the shared aiohttp session used for every JIRA REST call"""
+        return aiohttp.ClientSession(
+            auth=aiohttp.BasicAuth(JIRA_EMAIL, JIRA_API_TOKEN),
+            headers=headers,
+            connector=aiohttp.TCPConnector(limit=20),
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+
+db_pool = None
+
+def get_db_pool() -> ThreadedConnectionPool:
+        """Create the shared PostgreSQL connection pool on first use"""
+        global db_pool
+        if db_pool is None:
+            db_pool = ThreadedConnectionPool(minconn=2, maxconn=25, **DB_CONFIG)
+        return db_pool
+
+@contextmanager
+def get_conn():
+        """Borrow a pooled connection; commit on success, roll back on error"""
+        pool = get_db_pool()
+        conn = pool.getconn()
         try:
-            return psycopg2.connect(**DB_CONFIG)
-        except psycopg2.Error as e:
-            print(f"Database connection failed: {e}")
-            return None
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn)
+
+# Keys found in commit messages; kept apart from commit_jira, which jira_script.py owns
+SCHEMA_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS commit_message_jira_keys (
+        sha TEXT NOT NULL,
+        jira_key TEXT NOT NULL,
+        PRIMARY KEY (sha, jira_key)
+    )
+    """,
+    # Commits whose message was already searched, whether or not it held a key
+    """
+    CREATE TABLE IF NOT EXISTS commit_message_scanned (
+        sha TEXT PRIMARY KEY
+    )
+    """,
+]
+
+# Indexes backing the contributor lookups and joins below
+INDEX_DDL = [
+    # Unique so new logins can be inserted with ON CONFLICT
+    "CREATE UNIQUE INDEX IF NOT EXISTS commit_contributors_login_ci_idx ON commit_contributors (LOWER(TRIM(login)))",
+    "CREATE INDEX IF NOT EXISTS commit_history_author_idx ON commit_history (author)",
+    "CREATE INDEX IF NOT EXISTS jira_issue_commits_key_idx ON jira_issue_commits (jira_key)",
+]
+
+# Case and whitespace variants of one login, which would make the unique index fail to build
+DUPLICATE_LOGINS_SQL = """
+    SELECT LOWER(TRIM(login)), array_agg(login ORDER BY login)
+    FROM commit_contributors
+    GROUP BY LOWER(TRIM(login))
+    HAVING COUNT(*) > 1
+    ORDER BY 1
+"""
+
+# Per-login UPDATEs issued in a loop, planned once per connection
+PREPARED_STATEMENTS = {
+    "set_team_member": """
+        UPDATE commit_contributors
+        SET team_member = $1
+        WHERE login = $2
+    """,
+    "set_contributor_details": """
+        UPDATE commit_contributors
+        SET team_member = $1,
+            team = COALESCE($2, team),
+            vendor = COALESCE($3, vendor)
+        WHERE login = $4
+    """,
+}
+
+def ensure_schema():
+        """Create the tables this script writes if they are missing"""
+        with get_conn() as conn, conn.cursor() as cursor:
+            for ddl in SCHEMA_DDL:
+                cursor.execute(ddl)
+
+def ensure_indexes():
+        """Create the supporting indexes if they are missing"""
+        with get_conn() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('commit_contributors_login_ci_idx')")
+            if cursor.fetchone()[0] is None:
+                # Commits are matched to these rows by exact login, so the variants are left for an operator to merge
+                cursor.execute(DUPLICATE_LOGINS_SQL)
+                duplicates = cursor.fetchall()
+                if duplicates:
+                    listed = "; ".join(", ".join(map(repr, logins)) for _, logins in duplicates)
+                    raise RuntimeError(
+                        f"commit_contributors has {len(duplicates)} logins stored under several spellings "
+                        f"({listed}); merge them before commit_contributors_login_ci_idx can be created"
+                    )
+            for ddl in INDEX_DDL:
+                cursor.execute(ddl)
+
+def prepare_statements(cursor):
+    """PREPARE the hot UPDATEs on this cursor's connection unless already prepared"""
+    cursor.execute("SELECT name FROM pg_prepared_statements")
+    prepared = {row[0] for row in cursor.fetchall()}
+    for name, statement in PREPARED_STATEMENTS.items():
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} AS {statement}")
+
+def _join_field_options(value: list) -> str:
+        return ", ".join(
+            item.get("value") or item.get("name") or str(item)
+            for item in value if isinstance(item, dict)
+        )
+
+# Custom field renderers keyed by the JSON type of the field value
+FIELD_VALUE_DISPATCH = {
+    dict: lambda value: value.get("value") or value.get("name"),
+    list: _join_field_options,
+}
+
+# Match patterns like PROJ-123, PROJECT-456, etc. in either case
+JIRA_KEY_RE = re.compile(r'[A-Za-z][A-Za-z0-9]*-[0-9]+')
 
 def extract_jira_issue_keys(message: str) -> List[str]:
         """Extract JIRA issue keys from commit message (e.g., PROJ-123)"""
         if not message:
             return []
-        # Match patterns like PROJ-123, PROJECT-456, etc.
-        return re.findall(r'([A-Z][A-Z0-9]*-[0-9]+)', message.upper())
+        # Upper-case only the matched keys, not the whole message
+        return [match.group(0).upper() for match in JIRA_KEY_RE.finditer(message)]
     
 class JiraProcessor:
-    def __init__(self, db_conn=None):
-        self.db_conn = db_conn or create_db_connection()
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        self.session = session
         self.github_jira_mapping = {}
-        self.issue_cache = {}
+        self.issue_cache = {}  # in-process L1 in front of the on-disk response cache
+        self.response_cache = ResponseCache(JIRA_CACHE_PATH, expire_after=JIRA_CACHE_TTL)
+        self.team_field_id = TEAM_FIELD_ID
+        self.vendor_field_id = VENDOR_FIELD_ID
+        self.sprint_field_id = SPRINT_FIELD_ID
         self._load_login_mappings()  # Load existing mappings at initialization
 
+    @property
+    def issue_fields(self) -> str:
+        """The narrowed fields= parameter for issue and search requests"""
+        return f"{self.team_field_id},{self.vendor_field_id},{self.sprint_field_id},{ISSUE_BASE_FIELDS}"
+
+    async def resolve_field_ids(self):
+        """Look up the configured custom field names once and remember their IDs"""
+        try:
+            fields = await self._get_json(
+                f"{JIRA_BASE_URL}/rest/api/3/field", expire_after=JIRA_FIELD_CACHE_TTL
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Failed fetching JIRA fields, using default field IDs: {e}")
+            return
+
+        field_by_name = {field["name"]: field["id"] for field in fields}
+        for attr, name in (("team_field_id", JIRA_FIELD_NAMES['team']),
+                           ("vendor_field_id", JIRA_FIELD_NAMES['vendor']),
+                           ("sprint_field_id", JIRA_FIELD_NAMES['sprint'])):
+            if name in field_by_name:
+                setattr(self, attr, field_by_name[name])
+            else:
+                print(f"JIRA field '{name}' not found, using {getattr(self, attr)}")
+
     def _load_login_mappings(self):
         """Load existing login mappings from database into memory"""
-        with self.db_conn.cursor() as cursor:
+        with get_conn() as conn, conn.cursor(name="login_mappings", cursor_factory=NamedTupleCursor) as cursor:
+            cursor.itersize = STREAM_ITERSIZE
             cursor.execute("SELECT login, username FROM user_login_mappings")
-            for login, username in cursor:
-                self.github_jira_mapping[login.lower()] = username
+            for row in cursor:
+                self.github_jira_mapping[row.login.lower()] = row.username
 
 
     def populate_commit_contributors_from_commits(self):
         """Populate commit_contributors table with GitHub logins and map to JIRA users"""
-        with self.db_conn.cursor() as cursor:
+        with get_conn() as conn, conn.cursor() as cursor:
             # First insert new logins that don't exist yet
             cursor.execute("""
                 INSERT INTO commit_contributors (login)
                 SELECT DISTINCT TRIM(author)
                 FROM commit_history
                 WHERE author IS NOT NULL
-                AND LOWER(TRIM(author)) NOT IN (
-                    SELECT LOWER(TRIM(login)) FROM commit_contributors
-                )
+                ON CONFLICT ((LOWER(TRIM(login)))) DO NOTHING
                 RETURNING login
             """)
-            new_logins = [row[0] for row in cursor.fetchall()]
+            print(f"Added {cursor.rowcount} new contributors")
             
-            # For new logins, try to find mappings
-            for login in new_logins:
-                normalized_login = login.lower()
-                if normalized_login in self.github_jira_mapping:
-                    team_member = self.github_jira_mapping[normalized_login]
-                    cursor.execute("""
-                        UPDATE commit_contributors
-                        SET team_member = %s
-                        WHERE login = %s
-                    """, (team_member, login))
-            
-            self.db_conn.commit()
+            # Map every unassigned login from the stored login mappings in one pass
+            cursor.execute("""
+                UPDATE commit_contributors cc
+                SET team_member = ulm.username
+                FROM user_login_mappings ulm
+                WHERE LOWER(TRIM(cc.login)) = ulm.login
+                AND cc.team_member IS NULL
+            """)
 
     def _update_login_mappings(self, cursor):
         """Update the login mappings table with new mappings"""
-        for login, team_member in self.github_jira_mapping.items():
-            if not login or not team_member:
-                continue
-                
-            cursor.execute("""
-                INSERT INTO user_login_mappings (login, username)
-                VALUES (%s, %s)
-                ON CONFLICT (login) DO UPDATE
-                SET username = EXCLUDED.username
-            """, (login.lower(), team_member))
-            
-            # Also update commit_contributors for this login
-            cursor.execute("""
-                UPDATE commit_contributors
-                SET team_member = %s
-                WHERE login = %s
-                AND (team_member IS NULL OR team_member != %s)
-            """, (team_member, login, team_member))
+        mappings = [
+            (login.lower(), team_member)
+            for login, team_member in self.github_jira_mapping.items()
+            if login and team_member
+        ]
+        if not mappings:
+            return
+
+        execute_values(cursor, """
+            INSERT INTO user_login_mappings (login, username)
+            VALUES %s
+            ON CONFLICT (login) DO UPDATE
+            SET username = EXCLUDED.username
+        """, mappings, page_size=1000)
+
+        # Also update commit_contributors for every mapped login
+        execute_values(cursor, """
+            UPDATE commit_contributors cc
+            SET team_member = v.team_member
+            FROM (VALUES %s) AS v(login, team_member)
+            WHERE cc.login = v.login
+            AND (cc.team_member IS NULL OR cc.team_member != v.team_member)
+        """, mappings, page_size=1000)
 
     async def process_commit_jira_links(self):
         """Process commits that reference JIRA issues to find user mappings"""
-        with self.db_conn.cursor() as cursor:
+        with get_conn() as conn, conn.cursor() as cursor:
+            # Record which commits mention which JIRA keys without pulling messages out of PostgreSQL;
+            # messages never change, so each commit is marked scanned and searched only once
             cursor.execute("""
-                SELECT ch.sha, ch.commit_message, cc.login, cc.team_member
-                FROM commit_history ch
-                JOIN commit_contributors cc ON ch.author = cc.login
-                WHERE ch.commit_message ~ '[A-Z][A-Z0-9]*-[0-9]+'
-                  AND (cc.team_member IS NULL OR cc.team_member = 'Unknown')
-            """)
-
-            commits = cursor.fetchall()
-            for sha, message, login, _ in commits:
-                # First check if we already have a mapping for this login
-                normalized_login = login.lower()
-                if normalized_login in self.github_jira_mapping:
-                    team_member = self.github_jira_mapping[normalized_login]
-                    cursor.execute("""
-                        UPDATE commit_contributors
-                        SET team_member = %s
-                        WHERE login = %s
-                    """, (team_member, login))
-                    continue
-                
-                # If no mapping exists, try to find one via JIRA issues
-                for issue_key in extract_jira_issue_keys(message):
-                    issue = await self._fetch_jira_issue(issue_key)
-                    if not issue:
-                        continue
-
-                    assignee = issue.get("fields", {}).get("assignee")
-                    if not assignee:
+                WITH scanned AS (
+                    INSERT INTO commit_message_scanned (sha)
+                    SELECT ch.sha
+                    FROM commit_history ch
+                    WHERE NOT EXISTS (SELECT 1 FROM commit_message_scanned s WHERE s.sha = ch.sha)
+                    ON CONFLICT (sha) DO NOTHING
+                    RETURNING sha
+                )
+                INSERT INTO commit_message_jira_keys (sha, jira_key)
+                SELECT ch.sha, UPPER(m[1])
+                FROM scanned s
+                JOIN commit_history ch ON ch.sha = s.sha,
+                     LATERAL regexp_matches(ch.commit_message, %s, 'g') AS m
+                ON CONFLICT (sha, jira_key) DO NOTHING
+            """, (JIRA_KEY_RE.pattern,))
+
+            prepare_statements(cursor)
+
+            # Only unmapped contributors with JIRA-linked commits need a lookup
+            with conn.cursor(name="unmapped_contributors", cursor_factory=NamedTupleCursor) as contributors:
+                contributors.itersize = STREAM_ITERSIZE
+                contributors.execute("""
+                    SELECT cc.login, array_agg(DISTINCT mk.jira_key) AS issue_keys
+                    FROM commit_contributors cc
+                    JOIN commit_history ch ON ch.author = cc.login
+                    JOIN commit_message_jira_keys mk ON mk.sha = ch.sha
+                    WHERE cc.team_member IS NULL OR cc.team_member = 'Unknown'
+                    GROUP BY cc.login
+                """)
+                for row in contributors:
+                    login, issue_keys = row.login, row.issue_keys
+                    # First check if we already have a mapping for this login
+                    normalized_login = login.lower()
+                    if normalized_login in self.github_jira_mapping:
+                        team_member = self.github_jira_mapping[normalized_login]
+                        cursor.execute("EXECUTE set_team_member (%s, %s)", (team_member, login))
                         continue
-
-                    assignee_name = assignee.get("displayName")
-                    assignee_email = assignee.get("emailAddress")
-                    team = self._get_field_value(issue["fields"], TEAM_FIELD_ID)
-                    vendor = self._get_field_value(issue["fields"], VENDOR_FIELD_ID)
-
-                    if assignee_name:
-                        # Store the new mapping
-                        self.github_jira_mapping[normalized_login] = assignee_name
-                        cursor.execute("""
-                            UPDATE commit_contributors
-                            SET team_member = %s,
-                                team = COALESCE(%s, team),
-                                vendor = COALESCE(%s, vendor)
-                            WHERE login = %s
-                        """, (assignee_name, team, vendor, login))
-                        break
+                
+                    # If no mapping exists, try to find one via JIRA issues
+                    # (served from the bulk search index; only unknown keys hit the API)
+                    for issue_key in issue_keys:
+                        issue = await self._fetch_jira_issue(issue_key)
+                        if not issue:
+                            continue
+
+                        assignee = issue.get("fields", {}).get("assignee")
+                        if not assignee:
+                            continue
+
+                        fields = issue["fields"]
+                        assignee_name = assignee.get("displayName")
+                        assignee_email = assignee.get("emailAddress")
+                        team = self._get_field_value(fields.get(self.team_field_id))
+                        vendor = self._get_field_value(fields.get(self.vendor_field_id))
+
+                        if assignee_name:
+                            # Store the new mapping
+                            self.github_jira_mapping[normalized_login] = assignee_name
+                            cursor.execute(
+                                "EXECUTE set_contributor_details (%s, %s, %s, %s)",
+                                (assignee_name, team, vendor, login)
+                            )
+                            break
 
             # Update all mappings at once
             self._update_login_mappings(cursor)
-            self.db_conn.commit()
     
-    async def _fetch_all_jira_issues(self) -> List[Dict[str, Any]]:
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                        expire_after: Optional[int] = None) -> Any:
+        """GET a JIRA resource through the on-disk cache, revalidating stale entries by ETag"""
+        key = cache_key(url, params)
+        cached = self.response_cache.lookup(key, expire_after)
+        if cached and cached.fresh:
+            return cached.body
+
+        request_headers = {"If-None-Match": cached.etag} if cached and cached.etag else None
+        async with self.session.get(url, params=params, headers=request_headers) as response:
+            if response.status == 304 and cached:
+                self.response_cache.refresh(key)
+                return cached.body
+            response.raise_for_status()
+            body = await response.read()
+            self.response_cache.store(key, body, response.headers.get("ETag"))
+            return json_loads(body)
+
+    async def _fetch_jira_search_page(self, start_at: int) -> Dict[str, Any]:
+        """Fetch one page of the JIRA issue search"""
+        params = {
+            "maxResults": JIRA_PAGE_SIZE,
+            "startAt": start_at,
+            "fields": self.issue_fields
+        }
+        return await self._get_json(f"{JIRA_BASE_URL}/rest/api/3/search", params)
+
+    async def _enqueue_issues(self, queue: asyncio.Queue, page: Dict[str, Any], all_issues: List[Dict[str, Any]]):
+        for issue in page.get("issues", []):
+            # Index the bulk result so per-key lookups never need their own request
+            if issue.get("key"):
+                self.issue_cache[issue["key"]] = issue
+            all_issues.append(issue)
+            await queue.put(issue)
+
+    async def _stream_jira_issues(self, queue: asyncio.Queue) -> List[Dict[str, Any]]:
+        """Fetch the first page to learn the total, then queue the remaining pages as they arrive"""
         all_issues = []
-        start_at = 0
-        max_results = 100
-
-        while True:
+        try:
+            first_page = await self._fetch_jira_search_page(0)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Failed fetching JIRA issues: {e}")
+            return all_issues
+
+        await self._enqueue_issues(queue, first_page, all_issues)
+        total = first_page.get("total", 0)
+        for next_page in asyncio.as_completed([
+            self._fetch_jira_search_page(start_at)
+            for start_at in range(JIRA_PAGE_SIZE, total, JIRA_PAGE_SIZE)
+        ]):
             try:
-                response = requests.get(
-                    f"{JIRA_BASE_URL}/rest/api/3/search",
-                    headers=headers,
-                    auth=auth,
-                    params={
-                        "maxResults": max_results,
-                        "startAt": start_at,
-                        "fields": f"{TEAM_FIELD_ID},{VENDOR_FIELD_ID},{SPRINT_FIELD_ID},status,assignee,reporter"
-                    },
-                    timeout=30
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                issues = data.get("issues", [])
-                if not issues:
-                    break
-
-                all_issues.extend(issues)
-                start_at += max_results
-
-                if start_at >= data.get("total", 0):
-                    break
-
-            except requests.RequestException as e:
+                page = await next_page
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 print(f"Failed fetching JIRA issues: {e}")
-                break
-
+                continue
+            await self._enqueue_issues(queue, page, all_issues)
         return all_issues
 
     async def _fetch_jira_issue(self, issue_key: str) -> Optional[Dict[str, Any]]:
@@ -228,38 +405,30 @@ class JiraProcessor:
             return self.issue_cache[issue_key]
 
         try:
-            response = requests.get(
+            issue = await self._get_json(
                 f"{JIRA_BASE_URL}/rest/api/3/issue/{issue_key}",
-                headers=headers,
-                auth=auth,
-                timeout=30
+                {"fields": self.issue_fields}
             )
-            response.raise_for_status()
-            issue = response.json()
             self.issue_cache[issue_key] = issue
             return issue
 
-        except requests.HTTPError as e:
-            if response.status_code == 404:
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
                 print(f"JIRA issue {issue_key} not found (404). Skipping.")
             else:
                 print(f"Error fetching JIRA issue {issue_key}: {e}")
             self.issue_cache[issue_key] = None  # Prevent retry
             return None
-
-    def _get_field_value(self, fields: Dict, field_id: str) -> Optional[str]:
-        if not fields or field_id not in fields:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching JIRA issue {issue_key}: {e}")
+            self.issue_cache[issue_key] = None  # Prevent retry
             return None
 
-        value = fields[field_id]
-        if isinstance(value, dict):
-            return value.get("value") or value.get("name")
-        elif isinstance(value, list):
-            return ", ".join(
-                item.get("value") or item.get("name") or str(item)
-                for item in value if isinstance(item, dict)
-            )
-        return str(value) if value else None
+    def _get_field_value(self, value: Any) -> Optional[str]:
+        """Render a custom field value (option dict, list of options or scalar) as text"""
+        if not value:
+            return None
+        return FIELD_VALUE_DISPATCH.get(type(value), str)(value)
     
     def extract_status(self,issue):
         try:
@@ -268,102 +437,133 @@ class JiraProcessor:
             print(f"⚠️ Status field missing in issue {issue.get('key')}: {e}")
             return "Unknown"
     
+    def _stage_row(self, issue: Dict[str, Any]) -> tuple:
+        fields = issue.get("fields", {})
+        sprints = fields.get(self.sprint_field_id, [])
+        name = sprints[0].get("name") if isinstance(sprints, list) and sprints else None
+        return (name, issue.get("key"), self.extract_status(issue))
+
+    def _upsert_issue_batch(self, batch: List[tuple]) -> tuple:
+        """Write one batch of staged issues, returning (inserts, updates)"""
+        # One staged row per issue; commit fan-out and change detection happen in SQL
+        staged = {row[1]: row for row in batch}
+        inserts = 0
+        updates = 0
+        with get_conn() as conn, conn.cursor() as cursor:
+            try:
+                cursor.execute("""
+                    CREATE TEMP TABLE jira_issue_stage (
+                        sprint TEXT,
+                        jira_key TEXT,
+                        status TEXT
+                    ) ON COMMIT DROP
+                """)
+                execute_values(cursor, "INSERT INTO jira_issue_stage VALUES %s",
+                               list(staged.values()), page_size=1000)
+
+                # Issues without commits get a single NULL commit_sha row; a commit that
+                # mentions several issues is written once so the upsert never hits a row twice
+                cursor.execute("""
+                    INSERT INTO jira_issue_commits (sprint, jira_key, status, commit_sha)
+                    SELECT DISTINCT ON (COALESCE(v.commit_sha, v.jira_key))
+                        v.sprint, v.jira_key, v.status, v.commit_sha
+                    FROM (
+                        SELECT s.sprint, s.jira_key, s.status, cj.sha AS commit_sha
+                        FROM jira_issue_stage s
+                        LEFT JOIN commit_jira cj ON cj.jira_key = s.jira_key
+                    ) v
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM jira_issue_commits j
+                        WHERE j.jira_key = v.jira_key
+                        AND j.commit_sha IS NOT DISTINCT FROM v.commit_sha
+                        AND j.status = v.status
+                    )
+                    ORDER BY COALESCE(v.commit_sha, v.jira_key), v.jira_key
+                    ON CONFLICT (commit_sha) DO UPDATE
+                    SET status = EXCLUDED.status
+                    WHERE jira_issue_commits.status IS DISTINCT FROM EXCLUDED.status
+                    RETURNING (xmax = 0) AS inserted
+                """)
+                for (inserted,) in cursor:
+                    if inserted:
+                        inserts += 1
+                    else:
+                        updates += 1
+            except psycopg2.Error as e:
+                print(f"Error inserting/updating JIRA issue commits: {e}")
+                conn.rollback()
+        return inserts, updates
+
+    async def _upsert_worker(self, queue: asyncio.Queue) -> tuple:
+        """Drain queued issues into the database in batches until the None sentinel"""
+        loop = asyncio.get_running_loop()
+        inserts = 0
+        updates = 0
+        batch = []
+        while True:
+            issue = await queue.get()
+            if issue is not None:
+                batch.append(self._stage_row(issue))
+            if batch and (issue is None or len(batch) >= UPSERT_BATCH_SIZE):
+                # The blocking psycopg2 write runs in a thread so fetching continues meanwhile
+                try:
+                    batch_inserts, batch_updates = await loop.run_in_executor(
+                        None, self._upsert_issue_batch, batch
+                    )
+                    inserts += batch_inserts
+                    updates += batch_updates
+                except Exception as e:
+                    # A failed batch must not stop the worker, or the producer blocks on a full queue
+                    print(f"Error writing a batch of {len(batch)} JIRA issues: {e}")
+                batch = []
+            if issue is None:
+                return inserts, updates
+
     async def process_jira_issues(self) -> List[Dict[str, Any]]:
-        all_issues = await self._fetch_all_jira_issues()
+        """Write JIRA issues to jira_issue_commits while the search pages are still arriving"""
+        queue = asyncio.Queue(maxsize=ISSUE_QUEUE_SIZE)
+        workers = [asyncio.create_task(self._upsert_worker(queue)) for _ in range(UPSERT_WORKERS)]
+        try:
+            all_issues = await self._stream_jira_issues(queue)
+        finally:
+            # Stop the workers even when the fetch fails, so none is left waiting on the queue
+            for _ in workers:
+                await queue.put(None)
+            results = await asyncio.gather(*workers)
+
         if not all_issues:
             print("No JIRA issues found to process")
             return []
 
-        with self.db_conn.cursor() as cursor:
-            # Fetch existing entries for comparison
-            cursor.execute("""
-                SELECT jira_key, status, commit_sha FROM jira_issue_commits
-            """)
-            existing_entries = cursor.fetchall()
-            existing_map = {(row[0], row[2]): row[1] for row in existing_entries}  # {(jira_key, commit_sha): status}
-
-            # Get all existing Jira keys in the database
-            cursor.execute("SELECT DISTINCT jira_key FROM jira_issue_commits")
-            existing_jira_keys = {row[0] for row in cursor.fetchall()}
-
-            # Get existing commit associations from commit_jira
-            cursor.execute("SELECT jira_key, sha FROM commit_jira")
-            commit_jira_pairs = cursor.fetchall()
-            jira_commits = {}
-            for jira_key, sha in commit_jira_pairs:
-                if jira_key not in jira_commits:
-                    jira_commits[jira_key] = set()
-                jira_commits[jira_key].add(sha)
-
-            inserts = 0
-            updates = 0
-
-            for issue in all_issues:
-                fields = issue.get("fields", {})
-                key = issue.get("key")
-                sprints = fields.get(SPRINT_FIELD_ID, [])
-                name = sprints[0].get("name") if isinstance(sprints, list) and sprints else None
-                status = self.extract_status(issue)
-                commits = jira_commits.get(key, [None])  # None represents cases with no commit
-
-                # Check if this is a new Jira key (regardless of commits)
-                is_new_jira_key = key not in existing_jira_keys
-
-                for commit_sha in commits:
-                    entry_key = (key, commit_sha)
-                    existing_status = existing_map.get(entry_key)
-
-                    # Determine if we need to insert/update
-                    if is_new_jira_key:
-                        # Case 1: New Jira key - insert all its commits
-                        should_insert = True
-                    elif existing_status is None:
-                        # Case 2: New commit for existing Jira key
-                        should_insert = True
-                    elif existing_status != status:
-                        # Case 3: Status changed for existing Jira key/commit
-                        should_insert = True
-                    else:
-                        # No change needed
-                        continue
-                    if should_insert:
-                        try:
-                            cursor.execute("""
-                                INSERT INTO jira_issue_commits (sprint, jira_key, status, commit_sha)
-                                VALUES (%s, %s, %s, %s)
-                                ON CONFLICT (commit_sha) DO UPDATE
-                                SET status = EXCLUDED.status
-                                WHERE jira_issue_commits.status != EXCLUDED.status
-                            """, (name, key, status, commit_sha))
-                            
-                            if existing_status is None:
-                                inserts += 1
-                            else:
-                                updates += 1
-                        except psycopg2.Error as e:
-                            print(f"Error inserting/updating {key} with commit {commit_sha}: {e}")
-                            self.db_conn.rollback()
-
-            self.db_conn.commit()
-            print(f"✅ Processed JIRA issues: {inserts} inserts, {updates} updates.")
+        inserts = sum(batch_inserts for batch_inserts, _ in results)
+        updates = sum(batch_updates for _, batch_updates in results)
+        print(f"✅ Processed JIRA issues: {inserts} inserts, {updates} updates.")
         return all_issues
 
 async def async_main():
     """Async entry point"""
     print("\nEnriching with JIRA data...")
-    jira_processor = JiraProcessor()
-    try:
-        jira_processor.populate_commit_contributors_from_commits()
-        
-        print("\nProcessing JIRA issues...")
-        await jira_processor.process_jira_issues()
-        
-        print("\nMapping commits to JIRA issues...")
-        await jira_processor.process_commit_jira_links()
-        
-        print("✅ JIRA data processing complete")
-    except Exception as e:
-        print(f"❌ Error processing JIRA data: {e}")
+    async with create_jira_session() as session:
+        jira_processor = JiraProcessor(session=session)
+        try:
+            ensure_schema()
+            ensure_indexes()
+            await jira_processor.resolve_field_ids()
+
+            # Contributor population is pure SQL, so it runs alongside the JIRA fetch
+            print("\nProcessing JIRA issues...")
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                loop.run_in_executor(None, jira_processor.populate_commit_contributors_from_commits),
+                jira_processor.process_jira_issues()
+            )
+            
+            print("\nMapping commits to JIRA issues...")
+            await jira_processor.process_commit_jira_links()
+            
+            print("✅ JIRA data processing complete")
+        except Exception as e:
+            print(f"❌ Error processing JIRA data: {e}")
                 
 def main():
     """Sync wrapper for async main"""
@@ -1,51 +1,38 @@
 import requests
+import aiohttp
+import asyncio
+import re
 import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict
 from datetime import datetime, timezone
+from collections import defaultdict
 import time
-import configparser
-from pathlib import Path
+from http_cache import ResponseCache, cache_key, json_dumps, json_loads
+from config import SETTINGS
 
 # Configuration
 
-def load_config():
-    #Loading configuration from .github_analyzer_config file
-    config = configparser.ConfigParser()
-    project_config = Path('.github_analyzer_config')
-    if project_config.exists():
-        config.read(project_config)
-        return config
-
-    raise FileNotFoundError("No .github_analyzer_config found in project root or home directory")
-try:
-        config = load_config()
-        github_config = {
-                'token': config.get('GITHUB', 'TOKEN'),
-                'repo': config.get('GITHUB', 'REPO'),
-                'owner': config.get('GITHUB', 'OWNER')
-            }
-        jira_config = {
-                'base_url': config.get('JIRA', 'URL'),
-                'email': config.get('JIRA', 'EMAIL'),
-                'token': config.get('JIRA', 'TOKEN')
-            }
-        
-        DB_CONFIG = {
-            'dbname': config.get('DATABASE', 'NAME'),
-            'user': config.get('DATABASE', 'USER'),
-            'password': config.get('DATABASE', 'PASSWORD'),
-            'host': config.get('DATABASE', 'HOST'),
-            'port': config.get('DATABASE', 'PORT')
-        }
-except Exception as e:
-        print(f"Config error: {e}")
-        exit(1)
+github_config = SETTINGS.github
+jira_config = SETTINGS.jira
+DB_CONFIG = SETTINGS.db_config
 JIRA_API_URL = f"{jira_config['base_url']}/rest/api/3"
 JIRA_EMAIL = jira_config["email"]
 JIRA_API_TOKEN = jira_config["token"]
 GITHUB_API_URL = f"https://api.github.com/repos/{github_config['owner']}/{github_config['repo']}"
 GITHUB_TOKEN=github_config["token"]
+JIRA_AUTH = aiohttp.BasicAuth(JIRA_EMAIL, JIRA_API_TOKEN)
+STAGE_CONCURRENCY = 10  # parallel Jira keys, keeps us well inside the API budgets
+GITHUB_HEADERS = {
+    "Authorization": f"token {GITHUB_TOKEN}",
+    "Accept": "application/vnd.github.v3+json"
+}
+LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)>;\s*rel="last"')
+JIRA_KEY_RE = re.compile(r'[A-Z][A-Z0-9]*-[0-9]+')
+GITHUB_CACHE_PATH = '.github_cache.sqlite'
 
 
 def fetch_jira_issues(project: str = "GJA", max_results: int = 1000) -> List[str]:
@@ -65,23 +52,23 @@ def fetch_jira_issues(project: str = "GJA", max_results: int = 1000) -> List[str
     try:
         response = requests.post(url, headers=headers, auth=auth, json=query)
         response.raise_for_status()
-        return [issue["key"] for issue in response.json()["issues"]]
+        return [issue["key"] for issue in json_loads(response.content)["issues"]]
     except Exception as e:
         print(f"Error fetching Jira issues: {e}")
         print(f"Response: {response.text}")  # Debug: Print full error
         return []
 
-def fetch_jira_transitions(jira_key: str) -> List[Dict]:
+async def fetch_jira_transitions(session: aiohttp.ClientSession, jira_key: str) -> List[Dict]:
     """Fetch stage transitions (e.g., TO DO → IN PROGRESS) for a Jira issue."""
     url = f"{JIRA_API_URL}/issue/{jira_key}/changelog"
     headers = {"Accept": "application/json"}
-    auth = (JIRA_EMAIL, JIRA_API_TOKEN)
     
     try:
-        response = requests.get(url, headers=headers, auth=auth)
-        response.raise_for_status()
+        async with session.get(url, headers=headers, auth=JIRA_AUTH) as response:
+            response.raise_for_status()
+            data = json_loads(await response.read())
         transitions = []
-        for history in response.json()["values"]:
+        for history in data["values"]:
             for item in history["items"]:
                 if item["field"] == "status":
                     transitions.append({
@@ -95,30 +82,57 @@ def fetch_jira_transitions(jira_key: str) -> List[Dict]:
         print(f"Error fetching transitions for {jira_key}: {e}")
         return []
     
-def get_all_branches() -> List[str]:
-    """Fetch all branches in the repository."""
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    branches = []
-    page = 1
-    
+github_cache = None
+
+def get_github_cache() -> ResponseCache:
+    """Open the GitHub response cache on first use."""
+    global github_cache
+    if github_cache is None:
+        # Always revalidate: a 304 costs no rate-limit quota and skips the download
+        github_cache = ResponseCache(GITHUB_CACHE_PATH, expire_after=0)
+    return github_cache
+
+async def github_get(session: aiohttp.ClientSession, url: str, params: Dict = None):
+    """GET a GitHub resource, returning the JSON body and the Link header.
+
+    The cached copy is revalidated with If-None-Match, and rate limiting waits
+    without blocking the other requests in flight.
+    """
+    cache = get_github_cache()
+    key = cache_key(url, params)
+    cached = cache.lookup(key)
+    headers = dict(GITHUB_HEADERS)
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+
     while True:
-        try:
-            url = f"{GITHUB_API_URL}/branches?per_page=100&page={page}"
-            response = requests.get(url, headers=headers)
-            
+        async with session.get(url, headers=headers, params=params) as response:
             # Handle rate limiting
-            if response.status_code == 403:
+            if response.status == 403:
                 reset_time = int(response.headers.get('X-RateLimit-Reset', time.time() + 60))
-                sleep_time = max(reset_time - time.time(), 0) + 5
+                sleep_time = max(reset_time - time.time(), 0) + 1
                 print(f"Rate limit exceeded. Sleeping for {sleep_time} seconds...")
-                time.sleep(sleep_time)
+                await asyncio.sleep(sleep_time)
                 continue
-            
+
+            if response.status == 304 and cached:
+                cache.refresh(key)
+                return cached.body["data"], cached.body["link"]
+
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(await response.read())
+            link = response.headers.get("Link", "")
+            cache.store(key, json_dumps({"data": data, "link": link}), response.headers.get("ETag"))
+            return data, link
+
+async def get_all_branches(session: aiohttp.ClientSession) -> List[str]:
+    """Fetch all branches in the repository."""
+    branches = []
+    page = 1
+    
+    while True:
+        try:
+            data, _ = await github_get(session, f"{GITHUB_API_URL}/branches", {"per_page": 100, "page": page})
             if not data:
                 break
                 
@@ -133,81 +147,89 @@ def get_all_branches() -> List[str]:
     
     return branches
 
-def get_commits_for_jira_key(jira_key: str) -> List[Dict]:
-    """Fetch commits linked to a Jira key from all branches."""
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
+async def fetch_commit_page(session: aiohttp.ClientSession, branch: str, page: int):
+    """Fetch one page of commits for a branch, returning the commits and the Link header."""
+    params = {
+        "per_page": 100,
+        "page": page,
+        "sha": branch
     }
-    commits = []
-    branches = get_all_branches()
-    
-    for branch in branches:
-        page = 1
-        while True:
-            try:
-                url = f"{GITHUB_API_URL}/commits"
-                params = {
-                    "per_page": 100,
-                    "page": page,
-                    "sha": branch,
-                    "commit_message": jira_key
-                }
-                response = requests.get(url, headers=headers, params=params)
-                
-                # Handle rate limiting
-                if response.status_code == 403:
-                    reset_time = int(response.headers.get('X-RateLimit-Reset', time.time() + 60))
-                    sleep_time = max(reset_time - time.time(), 0) + 5
-                    print(f"Rate limit exceeded. Sleeping for {sleep_time} seconds...")
-                    time.sleep(sleep_time)
-                    continue
-                
-                response.raise_for_status()
-                data = response.json()
-                if not data:
-                    break
-                
-                for commit in data:
-                    if jira_key.lower() in commit["commit"]["message"].lower():
-                        commits.append({
-                            "sha": commit["sha"],
-                            "date": datetime.strptime(
-                                commit["commit"]["author"]["date"],
-                                "%Y-%m-%dT%H:%M:%SZ"
-                            ).replace(tzinfo=timezone.utc)
-                        })
-                
-                if "next" not in response.links:
-                    break
-                page += 1
-                
-            except Exception as e:
-                print(f"Error fetching commits from branch {branch}: {e}")
-                break
+    return await github_get(session, f"{GITHUB_API_URL}/commits", params)
+
+async def build_commit_index(session: aiohttp.ClientSession) -> Dict[str, List[Dict]]:
+    """Walk every branch once and group the unique commits by the Jira keys in their messages."""
+    branches = await get_all_branches(session)
+
+    # The first page of every branch also tells us how many pages follow
+    first_pages = await asyncio.gather(
+        *(fetch_commit_page(session, branch, 1) for branch in branches),
+        return_exceptions=True
+    )
+    pages = []
+    remaining = []
+    for branch, result in zip(branches, first_pages):
+        if isinstance(result, Exception):
+            print(f"Error fetching commits from branch {branch}: {result}")
+            continue
+        data, link = result
+        pages.append(data)
+        last_page = LAST_PAGE_RE.search(link)
+        if last_page:
+            remaining.extend((branch, page) for page in range(2, int(last_page.group(1)) + 1))
+
+    results = await asyncio.gather(
+        *(fetch_commit_page(session, branch, page) for branch, page in remaining),
+        return_exceptions=True
+    )
+    for (branch, _), result in zip(remaining, results):
+        if isinstance(result, Exception):
+            print(f"Error fetching commits from branch {branch}: {result}")
+            continue
+        pages.append(result[0])
+
+    # Branches share history, so each commit is indexed only the first time it is seen
+    commit_index = defaultdict(list)
+    seen_shas = set()
+    for data in pages:
+        for commit in data:
+            if commit["sha"] in seen_shas:
+                continue
+            seen_shas.add(commit["sha"])
+            jira_keys = set(JIRA_KEY_RE.findall(commit["commit"]["message"].upper()))
+            if not jira_keys:
+                continue
+            entry = {
+                "sha": commit["sha"],
+                "date": datetime.strptime(
+                    commit["commit"]["author"]["date"],
+                    "%Y-%m-%dT%H:%M:%SZ"
+                ).replace(tzinfo=timezone.utc)
+            }
+            for jira_key in jira_keys:
+                commit_index[jira_key].append(entry)
     
-    return commits
+    return commit_index
 
-def map_commits_to_stages(jira_key: str) -> List[Dict]:
+async def map_commits_to_stages(session: aiohttp.ClientSession, jira_key: str, commits: List[Dict]) -> List[Dict]:
     """Map commits to stages based on transition timestamps."""
-    transitions = fetch_jira_transitions(jira_key)
-    commits = get_commits_for_jira_key(jira_key)
-    
     if not commits:
         return []
     
+    transitions = await fetch_jira_transitions(session, jira_key)
     transitions.sort(key=lambda x: x["transition_date"])
-    commits.sort(key=lambda x: x["date"])
+    commits = sorted(commits, key=lambda x: x["date"])
     
     stage_commits = []
     current_stage = "TO DO"
+    next_transition = 0
     
+    # Both lists are sorted, so walk them together instead of rescanning every transition
     for commit in commits:
         commit_date = commit["date"]
-        for transition in transitions:
-            transition_date = transition["transition_date"]
-            if commit_date >= transition_date:
-                current_stage = transition["to_stage"]
+        while (next_transition < len(transitions)
+               and transitions[next_transition]["transition_date"] <= commit_date):
+            current_stage = transitions[next_transition]["to_stage"]
+            next_transition += 1
         
         stage_commits.append({
             "jira_key": jira_key,
@@ -218,40 +240,68 @@ def map_commits_to_stages(jira_key: str) -> List[Dict]:
     
     return stage_commits
 
+db_pool = None
+
+def get_db_pool() -> ThreadedConnectionPool:
+    """Create the shared PostgreSQL connection pool on first use."""
+    global db_pool
+    if db_pool is None:
+        db_pool = ThreadedConnectionPool(minconn=2, maxconn=25, **DB_CONFIG)
+    return db_pool
+
+@contextmanager
+def get_conn():
+    """Borrow a pooled connection; commit on success, roll back on error."""
+    pool = get_db_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
 def save_to_postgres(stage_commits: List[Dict]):
     """Save stage-commit mappings to PostgreSQL."""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cursor = conn.cursor()
-    
-    for entry in stage_commits:
-        cursor.execute("""
+    rows = [
+        (entry["jira_key"], entry["commit_sha"], entry["commit_date"], entry["stage"])
+        for entry in stage_commits
+    ]
+    with get_conn() as conn, conn.cursor() as cursor:
+        execute_values(cursor, """
             INSERT INTO jira_commit_stages 
             (jira_key, commit_sha, commit_date, stage)
-            VALUES (%s, %s, %s, %s)
+            VALUES %s
             ON CONFLICT (jira_key, commit_sha) DO NOTHING
-        """, (
-            entry["jira_key"],
-            entry["commit_sha"],
-            entry["commit_date"],
-            entry["stage"]
-        ))
-    
-    conn.commit()
-    cursor.close()
-    conn.close()
+        """, rows, page_size=1000)
 
-def main():
+async def async_main():
     """Orchestrate the workflow."""
     jira_keys = fetch_jira_issues("GJA")
     print(f"Found {len(jira_keys)} Jira issues to process.")
     
-    for key in jira_keys:
-        print(f"Processing {key}...")
-        stage_commits = map_commits_to_stages(key)
-        if stage_commits:
-            save_to_postgres(stage_commits)
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=20)) as session:
+        commit_index = await build_commit_index(session)
+        semaphore = asyncio.Semaphore(STAGE_CONCURRENCY)
+
+        async def process_key(key: str) -> List[Dict]:
+            async with semaphore:
+                print(f"Processing {key}...")
+                return await map_commits_to_stages(session, key, commit_index.get(key, []))
+
+        results = await asyncio.gather(*(process_key(key) for key in jira_keys))
+    
+    all_stage_commits = [entry for stage_commits in results for entry in stage_commits]
+    if all_stage_commits:
+        save_to_postgres(all_stage_commits)
     
     print("Data saved to PostgreSQL!")
 
+def main():
+    """Sync wrapper for async main"""
+    asyncio.run(async_main())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
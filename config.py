@@ -0,0 +1,55 @@
+import configparser
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+CONFIG_PATH = Path('.github_analyzer_config')
+
+@dataclass(frozen=True)
+class Settings:
+    github: Dict[str, str]
+    jira: Dict[str, str]
+    db_config: Dict[str, str]
+    jira_field_names: Dict[str, str]
+
+def load_config() -> configparser.ConfigParser:
+    #Loading configuration from .github_analyzer_config file
+    config = configparser.ConfigParser()
+    if CONFIG_PATH.exists():
+        config.read(CONFIG_PATH)
+        return config
+
+    raise FileNotFoundError("No .github_analyzer_config found in project root or home directory")
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse .github_analyzer_config once per process"""
+    config = load_config()
+    return Settings(
+        github={
+            'token': config.get('GITHUB', 'TOKEN'),
+            'repo': config.get('GITHUB', 'REPO'),
+            'owner': config.get('GITHUB', 'OWNER')
+        },
+        jira={
+            'base_url': config.get('JIRA', 'URL'),
+            'email': config.get('JIRA', 'EMAIL'),
+            'token': config.get('JIRA', 'TOKEN')
+        },
+        db_config={
+            'dbname': config.get('DATABASE', 'NAME'),
+            'user': config.get('DATABASE', 'USER'),
+            'password': config.get('DATABASE', 'PASSWORD'),
+            'host': config.get('DATABASE', 'HOST'),
+            'port': config.get('DATABASE', 'PORT')
+        },
+        # Custom fields are configured by display name and resolved to IDs at startup
+        jira_field_names={
+            'team': config.get('JIRA', 'TEAM_FIELD', fallback='Team'),
+            'vendor': config.get('JIRA', 'VENDOR_FIELD', fallback='Vendor'),
+            'sprint': config.get('JIRA', 'SPRINT_FIELD', fallback='Sprint')
+        }
+    )
+
+SETTINGS = get_settings()
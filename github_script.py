@@ -1,18 +1,28 @@
 import os
+import io
 import json
 import re
 import stat
 import asyncio
 import aiohttp
 import psycopg2
+from psycopg2.extensions import connection as BaseConnection
+from psycopg2.extras import Json, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import subprocess
 import shutil
+import sqlite3
+import tarfile
+import tempfile
+import threading
 import time
 from typing import Optional
 import configparser
 from pathlib import Path
-import requests
 from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from http_cache import json_dumps, json_loads
 
 def load_config():
     #Loading configuration from .github_analyzer_config file
@@ -49,72 +59,145 @@ HEADERS = {
     "Accept": "application/vnd.github.v3+json"
 }
 
-class RateLimiter:
-    # Rate limiting to avoid hitting GitHub API limits
-    def __init__(self):
-            self.last_request = 0
-            self.min_delay = 1.0  # seconds between requests
+def create_github_session() -> aiohttp.ClientSession:
+    #Creating the aiohttp session shared by every async GitHub call in a run
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60)
+    )
+
+COMMIT_BATCH_SIZE = 500  # commits buffered before one flush to PostgreSQL
+DETAIL_CONCURRENCY = 10  # commit-detail requests in flight across all branches
+BRANCH_CONCURRENCY = 4  # branches processed at once
+REPO_CACHE_DIR = os.path.join(os.getenv('TEMP', '/tmp'), 'gitjira_cache')  # one clone per repository
+repo_lock = threading.Lock()  # clone and fetch run one at a time on the shared cache
+scc_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+SCC_CACHE_PATH = '.scc_cache.sqlite'  # scc results per (repo, sha, filename), kept across runs
+scc_cache = None
+scc_cache_lock = threading.Lock()
+WORD_RE = re.compile(r'\b[a-z0-9]+\b')
+LAST_PAGE_RE = re.compile(r'<[^>]+[?&]page=(\d+)>;\s*rel="last"')
+TAG_RE = re.compile(r'#(\w+)|tags?:?\s*(\d+)', re.IGNORECASE)
+detail_semaphore = None
 
-    async def wait(self):
-            elapsed = time.time() - self.last_request
-            if elapsed < self.min_delay:
-                await asyncio.sleep(self.min_delay - elapsed)
-            self.last_request = time.time()
+db_pool = None
+
+# Tags, directories and file type counts are stored on the commit row itself
+COMMIT_HISTORY_COLUMNS = {
+    "tags": "text[]",
+    "directories": "text[]",
+    "file_types": "jsonb",
+}
 
-rate_limiter = RateLimiter()
+class PreparedConnection(BaseConnection):
+    # Pooled connection that prepares the fixed-shape per-page lookups once per session
+    prepared = False
+
+    def prepare_statements(self):
+        #Preparing the lookups the first time this connection runs them; they outlive transactions
+        if self.prepared:
+            return
+        with self.cursor() as cursor:
+            cursor.execute("""
+                PREPARE branch_shas (text, text) AS
+                SELECT cbr.sha
+                FROM commit_branch_relationship cbr
+                JOIN commit_history ch ON ch.sha = cbr.sha
+                WHERE ch.repository = $1 AND cbr.branch = $2
+            """)
+            cursor.execute("""
+                PREPARE stored_shas (text[]) AS
+                SELECT sha FROM commit_history WHERE sha = ANY($1)
+            """)
+        self.prepared = True
 
 def create_db_connection():
-    #Creating a connection to PostgreSQL database
+    #Borrowing a connection from the shared PostgreSQL pool, creating the pool on first use
+        global db_pool
         try:
-            return psycopg2.connect(**DB_CONFIG)
+            if db_pool is None:
+                db_pool = ThreadedConnectionPool(
+                    minconn=2, maxconn=8, connection_factory=PreparedConnection, **DB_CONFIG
+                )
+            return db_pool.getconn()
         except psycopg2.Error as e:
             print(f"Database connection failed: {e}")
             return None
 
-def get_all_branches(owner, repo, token=None):
-    # Fetching all branches for a given repository
-    branches = []
-    page = 1
-    headers = {
-        "Accept": "application/vnd.github.v3+json",
-        "Authorization": f"token {token}" if token else None
-    }
-    
-    while True: 
+def release_db_connection(conn):
+    #Returning a borrowed connection to the pool; an open transaction is rolled back
+        db_pool.putconn(conn)
+
+def ensure_commit_columns():
+    #Adding the per-commit attribute columns to commit_history if they are missing
+        conn = create_db_connection()
+        if not conn:
+            return False
         try:
-            url = f"https://api.github.com/repos/{owner}/{repo}/branches?per_page=100&page={page}"
-            print(f"Fetching branches from {url}...")
-            response = requests.get(url, headers=headers)
-            
+            with conn.cursor() as cursor:
+                # ALTER TABLE locks the whole table even when nothing changes, so only run it when a column is missing
+                cursor.execute("""
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_schema = current_schema() AND table_name = 'commit_history'
+                    AND column_name = ANY(%s)
+                """, (list(COMMIT_HISTORY_COLUMNS),))
+                existing = {row[0] for row in cursor.fetchall()}
+                missing = [column for column in COMMIT_HISTORY_COLUMNS if column not in existing]
+                if missing:
+                    cursor.execute("ALTER TABLE commit_history " + ", ".join(
+                        f"ADD COLUMN IF NOT EXISTS {column} {COMMIT_HISTORY_COLUMNS[column]}" for column in missing
+                    ))
+            conn.commit()
+            return True
+        except psycopg2.Error as e:
+            conn.rollback()
+            print(f"Failed to update commit_history columns: {e}")
+            return False
+        finally:
+            release_db_connection(conn)
+
+async def fetch_branch_page(session: aiohttp.ClientSession, owner: str, repo: str, page: int):
+    # Fetching one page of branches, returning the branch names and the Link header
+    url = f"{BASE_URL}/repos/{owner}/{repo}/branches"
+    while True:
+        print(f"Fetching branches from {url}?per_page=100&page={page}...")
+        async with session.get(url, headers=HEADERS, params={'per_page': 100, 'page': page}) as response:
             # Check for rate limiting
-            if response.status_code == 403 and 'X-RateLimit-Remaining' in response.headers:
+            if response.status == 403 and 'X-RateLimit-Remaining' in response.headers:
                 if int(response.headers['X-RateLimit-Remaining']) == 0:
                     reset_time = int(response.headers['X-RateLimit-Reset'])
                     sleep_time = max(reset_time - time.time(), 0) + 5
                     print(f"Rate limit exceeded. Sleeping for {sleep_time} seconds...")
-                    time.sleep(sleep_time)
+                    await asyncio.sleep(sleep_time)
                     continue
-            
-            response.raise_for_status()
-            
-            data = response.json()
-            if not data:
-                break
-                
-            branches.extend(branch['name'] for branch in data)
-            if len(data) < 100:
-                break
-            page += 1
-            
-        except requests.exceptions.HTTPError as e:
-            if response.status_code == 404:
+
+            if response.status == 404:
                 print(f"repository {owner}/{repo} not found or inaccessible")
-            else:
-                print(f"Error fetching branches: {e}")
-            break
-        except Exception as e:
-            print(f"Unexpected error: {e}")
-            break
+                return [], ''
+            response.raise_for_status()
+
+            data = json_loads(await response.read())
+            return [branch['name'] for branch in data], response.headers.get('Link', '')
+
+async def get_all_branches(session: aiohttp.ClientSession, owner: str, repo: str) -> list:
+    # Fetching all branches for a given repository
+    branches = []
+    try:
+        branches, link = await fetch_branch_page(session, owner, repo, 1)
+
+        # The first page says how many follow, so the rest are fetched together
+        last_page = LAST_PAGE_RE.search(link)
+        if last_page:
+            pages = await asyncio.gather(*(
+                fetch_branch_page(session, owner, repo, page)
+                for page in range(2, int(last_page.group(1)) + 1)
+            ))
+            for names, _ in pages:
+                branches.extend(names)
+
+    except aiohttp.ClientResponseError as e:
+        print(f"Error fetching branches: {e}")
+    except Exception as e:
+        print(f"Unexpected error: {e}")
     
     return branches
 
@@ -137,9 +220,9 @@ async def get_github_data(session: aiohttp.ClientSession, endpoint: str, params:
     for attempt in range(max_retries):
         try:
             async with session.get(url, headers=HEADERS, params=params) as response:
-                # Handle rate limits
-                remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-                if remaining <= 1:
+                # Handle rate limits; the budget headers are the only throttle
+                remaining = response.headers.get('X-RateLimit-Remaining')
+                if remaining is not None and int(remaining) <= 1:
                     reset_time = int(response.headers.get('X-RateLimit-Reset', time.time() + 3600))
                     sleep_time = max(reset_time - time.time(), 0) + 10
                     print(f"⚠️ Rate limit reached. Sleeping for {sleep_time} seconds...")
@@ -147,7 +230,7 @@ async def get_github_data(session: aiohttp.ClientSession, endpoint: str, params:
                     continue  # Retry after sleep
                 
                 if response.status == 200:
-                    return await response.json()
+                    return json_loads(await response.read())
                 elif response.status == 404:
                     print(f"❌ 404 Not Found: {url}")
                     return None
@@ -161,100 +244,302 @@ async def get_github_data(session: aiohttp.ClientSession, endpoint: str, params:
     print(f"❌ Failed after {max_retries} retries for {url}")
     return None
    
-async def fetch_and_store_commits(owner: str, repo: str, branch: str = "main") -> bool:
+async def fetch_commit_batch(session: aiohttp.ClientSession, owner: str, repo: str, commits: list) -> list:
+    # Fetching full commit details concurrently, as (commit, full_commit) pairs in page order
+    global detail_semaphore
+    if detail_semaphore is None:
+        # One semaphore for every branch, so concurrent branches share the request budget
+        detail_semaphore = asyncio.Semaphore(DETAIL_CONCURRENCY)
+
+    async def fetch_one(commit_data):
+        async with detail_semaphore:
+            return commit_data, await get_github_data(session, f"/repos/{owner}/{repo}/commits/{commit_data['sha']}")
+
+    return await asyncio.gather(*(fetch_one(commit_data) for commit_data in commits))
+
+def find_stored_shas(conn, shas):
+    #Returning which of the given SHAs already have a commit_history row
+    if not shas:
+        return set()
+    conn.prepare_statements()
+    with conn.cursor() as cursor:
+        cursor.execute("EXECUTE stored_shas(%s)", (shas,))
+        return {sha for (sha,) in cursor}
+
+async def fetch_and_store_commits(session: aiohttp.ClientSession, owner: str, repo: str, branch: str = "main") -> bool:
     # Fetch and store commits for a given repository and branch
-    async with aiohttp.ClientSession() as session:
-        repo_info = await get_repository_info(session, owner, repo)
-        if not repo_info:
-            print(f"Failed to get repository info for {owner}/{repo}")
-            return False
-            
-        repo_full_name = f"{owner}/{repo}"
-        repo_url = repo_info['html_url']
+    repo_info = await get_repository_info(session, owner, repo)
+    if not repo_info:
+        print(f"Failed to get repository info for {owner}/{repo}")
+        return False
         
-        conn = create_db_connection()
-        if not conn:
-            return False
+    repo_full_name = f"{owner}/{repo}"
+    repo_url = repo_info['html_url']
+    
+    conn = create_db_connection()
+    if not conn:
+        return False
+    
+    try:
+        page = 1
+        per_page = 100
+        processed_commits = 0
+        batch = CommitBatch()
+
+        # SHAs are content hashes, so commits already stored for this branch never change
+        conn.prepare_statements()
+        with conn.cursor() as cursor:
+            cursor.execute("EXECUTE branch_shas(%s, %s)", (repo_full_name, branch))
+            known_shas = {sha for (sha,) in cursor}
         
-        try:
-            page = 1
-            per_page = 100
-            processed_commits = 0
+        loop = asyncio.get_running_loop()
+        while True:
+            # Get paginated commits
+            commits_data = await get_github_data(
+                session,
+                f"/repos/{owner}/{repo}/commits",
+                params={
+                    'sha': branch,
+                    'per_page': per_page,
+                    'page': page
+                }
+            )
             
-            while True:
-                # Get paginated commits
-                commits_data = await get_github_data(
-                    session,
-                    f"/repos/{owner}/{repo}/commits",
-                    params={
-                        'sha': branch,
-                        'per_page': per_page,
-                        'page': page
-                    }
-                )
-                
-                if not commits_data or not isinstance(commits_data, list):
-                    print(f"Invalid commits data received for page {page}")
-                    break
-                
-                # Process commits in current page
-                for commit_data in commits_data:
-                    if not isinstance(commit_data, dict) or 'sha' not in commit_data:
-                        print(f"Skipping invalid commit data: {commit_data}")
+            if not commits_data or not isinstance(commits_data, list):
+                print(f"Invalid commits data received for page {page}")
+                break
+            
+            # Process commits in current page
+            page_commits = []
+            known_on_page = 0
+            for commit_data in commits_data:
+                if not isinstance(commit_data, dict) or 'sha' not in commit_data:
+                    print(f"Skipping invalid commit data: {commit_data}")
+                    continue
+                if commit_data['sha'] in known_shas:
+                    known_on_page += 1
+                    continue
+                page_commits.append(commit_data)
+
+            # Commits come newest first, so a page with nothing new means we reached the stored tip
+            if known_on_page and not page_commits:
+                print(f"Reached already stored commits on page {page}")
+                break
+
+            # Commits stored from another branch only need their branch relationship
+            stored_shas = find_stored_shas(conn, [commit_data['sha'] for commit_data in page_commits])
+            for sha in stored_shas:
+                batch.add_branch(sha, branch)
+            page_commits = [commit_data for commit_data in page_commits if commit_data['sha'] not in stored_shas]
+
+            # Get full commit details for the whole page at once
+            commit_pairs = await fetch_commit_batch(session, owner, repo, page_commits)
+
+            # Run scc for the page's commits in parallel and hand each result to CommitBatch.add
+            scanned = [full_commit for _, full_commit in commit_pairs if full_commit]
+            complexities = dict(zip(
+                (full_commit['sha'] for full_commit in scanned),
+                await asyncio.gather(*(
+                    loop.run_in_executor(
+                        scc_executor, get_commit_complexity,
+                        repo_full_name, full_commit['sha'], code_files(full_commit)
+                    )
+                    for full_commit in scanned
+                ))
+            ))
+
+            for commit_data, full_commit in commit_pairs:
+                try:
+                    if not full_commit:
+                        print(f"Failed to fetch details for commit {commit_data['sha']}")
                         continue
                         
-                    try:
-                        # Get full commit details
-                        full_commit = await get_github_data(
-                            session,
-                            f"/repos/{owner}/{repo}/commits/{commit_data['sha']}"
-                        )
+                    complexity = complexities.get(full_commit['sha'])
+                    if not batch.add(repo_full_name, repo_url, branch, full_commit, complexity):
+                        print(f"Failed to store commit {commit_data['sha']}")
                         
-                        if not full_commit:
-                            print(f"Failed to fetch details for commit {commit_data['sha']}")
-                            continue
-                            
-                        if store_commit_data(conn, repo_full_name, repo_url, branch, full_commit):
-                            processed_commits += 1
-                        else:
-                            print(f"Failed to store commit {commit_data['sha']}")
-                            
-                    except Exception as e:
-                        print(f"Error processing commit {commit_data.get('sha', 'unknown')}: {str(e)}")
-                        continue
-                
-                # Pagination control
-                if len(commits_data) < per_page:
-                    break
-                    
-                page += 1
-                await asyncio.sleep(1)  # Rate limiting
-            
-            print(f"✅ Successfully processed {processed_commits} commits for {repo_full_name} branch {branch}")
-            return True
+                except Exception as e:
+                    print(f"Error processing commit {commit_data.get('sha', 'unknown')}: {str(e)}")
+                    continue
+
+            if len(batch) >= COMMIT_BATCH_SIZE:
+                processed_commits += await loop.run_in_executor(None, batch.flush, conn)
             
-        except Exception as e:
-            print(f"Error processing {repo_full_name}: {str(e)}")
-            return False
-        finally:
-            conn.close()
+            # Pagination control
+            if len(commits_data) < per_page:
+                break
+                
+            page += 1
+        
+        processed_commits += await loop.run_in_executor(None, batch.flush, conn)
+        print(f"✅ Successfully processed {processed_commits} commits for {repo_full_name} branch {branch}")
+        return True
+        
+    except Exception as e:
+        print(f"Error processing {repo_full_name}: {str(e)}")
+        return False
+    finally:
+        release_db_connection(conn)
 
 
-def store_commit_data(conn, repo_full_name, repo_url, branch, commit_data):
-    #Store commit data in PostgreSQL across multiple related tables
-    if not conn:
-        return False
+# Lookup tables for file classification, built once at import
+LANGUAGE_MAPPING = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.java': 'Java',
+    '.go': 'Go',
+    '.rb': 'Ruby',
+    '.c': 'C',
+    '.h': 'C Header',
+    '.cpp': 'C++',
+    '.hpp': 'C++ Header',
+    '.cs': 'C#',
+    '.php': 'PHP',
+    '.swift': 'Swift',
+    '.kt': 'Kotlin',
+    '.scala': 'Scala',
+    '.rs': 'Rust',
+    '.sh': 'Shell Script',
+    '.pl': 'Perl',
+    '.r': 'R',
+    '.sql': 'SQL',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.json': 'JSON',
+    '.yml': 'YAML',
+    '.yaml': 'YAML',
+    '.xml': 'XML',
+    '.md': 'Markdown',
+    '.txt': 'Text',
+    '.ps1': 'PowerShell',
+    '.soql': 'SOQL',
+    '.sosl': 'SOSL',
+    '.apex': 'Apex',
+    '.cls': 'Apex Class',
+    '.trigger': 'Apex Trigger',
+    '.page': 'Visualforce Page',
+    '.component': 'Visualforce Component',
+    '.dockerfile': 'Dockerfile',
+    '.tf': 'Terraform',
+    '.ini': 'INI',
+    '.properties': 'Properties',
+    '.gitignore': 'Git Ignore',
+    '.forceignore': 'Salesforce Ignore',
+    '.sfdx-project': 'Salesforce Config',
+    '.eslintrc': 'ESLint Config',
+    '.babelrc': 'Babel Config',
+    '.prettierrc': 'Prettier Config',
+    '.stylelintrc': 'Stylelint Config',
+    '.editorconfig': 'EditorConfig',
+    '.npmignore': 'NPM Ignore',
+    '.dockerignore': 'Docker Ignore',
+    '.gitattributes': 'Git Attributes',
+    '.tpl': 'Terraform Plan',
+    '.npmrc': 'NPM Config',
+    '.bin': 'Binary',
+    '.exe': 'Executable',
+    '.tsx': 'TypeScript JSX',
+    '.cjs': 'CommonJS',
+    '.email': 'Email',
+    'prettierignore': 'Prettier',
+    '.prettierignore': 'Prettier',
+}
 
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute("BEGIN")
+SPECIAL_FILES = {
+    'dockerfile': 'Docker',
+    'makefile': 'Make',
+    'gitignore': 'Git',
+    'forceignore': 'Salesforce',
+    '.forceignore': 'Salesforce',
+    '.gitignore': 'Git',
+    'prettierignore': 'Prettier',
+    '.prettierignore': 'Prettier',
+    'prettierrc': 'Prettier',
+    '.prettierrc': 'Prettier',
+    '.eslintrc': 'ESLint',
+    '.babelrc': 'Babel',
+    '.stylelintrc': 'Stylelint',
+    '.editorconfig': 'EditorConfig',
+    '.npmignore': 'NPM',
+    '.dockerignore': 'Docker',
+    '.gitattributes': 'Git',
+    '.npmrc': 'NPM',
+    'husky/pre-commit': 'Husky',
+    '.husky/pre-commit': 'Husky',
+    '.github/workflows': 'GitHub Actions'
+}
+
+# Substring checks run in the table's order, so the first listed path wins as before
+SPECIAL_PATHS = tuple(SPECIAL_FILES)
+
+CODE_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.java', '.go', '.rb', '.php',
+    '.cpp', '.c', '.h', '.cs', '.swift', '.kt', '.scala',
+    '.rs', '.sh', '.sql', '.html', '.css', '.json', '.yml'
+})
+
+class LineStream(io.TextIOBase):
+    # Read-only file over a generator of lines, so COPY pulls rows without one big joined string
+    def __init__(self, lines):
+        self.lines = iter(lines)
+        self.pending = ''
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        chunks = [self.pending]
+        length = len(self.pending)
+        for line in self.lines:
+            chunks.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = ''.join(chunks)
+        if size < 0:
+            size = len(data)
+        self.pending = data[size:]
+        return data[:size]
+
+    def readline(self, size=-1):
+        if not self.pending:
+            self.pending = next(self.lines, '')
+        end = self.pending.find('\n') + 1 or len(self.pending)
+        line, self.pending = self.pending[:end], self.pending[end:]
+        return line
+
+class CommitBatch:
+    # Buffering table rows for many commits so they are written in one transaction
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.commits = {}  # sha -> rows per table, so ON CONFLICT DO UPDATE sees each sha once
+        self.cc_rows = {}  # filename -> (sha, row); the last commit processed wins
+        self.branch_rows = []  # (sha, branch) for commits already stored from another branch
+
+    def __len__(self):
+        return len(self.commits) + len(self.branch_rows)
+
+    def add_branch(self, sha, branch):
+        #Recording only the branch relationship of an already stored commit
+        self.branch_rows.append((sha, branch))
+
+    def add(self, repo_full_name, repo_url, branch, commit_data, complexity=None):
+        #Extracting the rows for one commit into the batch buffers
+        try:
             # First, extract all the data we'll need
             sha = commit_data['sha']
             if not sha:
                 print("⚠️ Commit missing SHA, skipping")
                 return False
+            if sha in self.commits:
+                self.commits[sha]['branches'].append((sha, branch))
+                return True
             commit_message = commit_data['commit']['message']
-            words = re.findall(r'\b[a-z0-9]+\b', commit_message.lower())
+            # each word is stored once per commit
+            words = {match.group(0) for match in WORD_RE.finditer(commit_message.lower())}
             author_name = None
             if commit_data.get('author') and commit_data['author'].get('login'):
                 author_name = commit_data['author']['login']
@@ -272,93 +557,26 @@ def store_commit_data(conn, repo_full_name, repo_url, branch, commit_data):
                     continue
                     
                 filename = file.get('filename', '')
-                if '.' in filename:
-                    _, extension = filename.rsplit('.', 1)
-                    extension = '.' + extension.lower()
-                elif '/' in filename:
-                    directory = filename.rsplit('/', 1)[0]
-                    directories.add(directory)  
-                else:
-                    extension = 'others'  # No extension
-                #print(f"Processing file: {filename} with extension: {extension}")            
+                if not filename:
+                    continue
+                directory, basename = os.path.split(filename)
+                if directory:
+                    directories.add(directory)
+                extension = os.path.splitext(basename)[1].lower() or 'others'  # No extension
                 extension_counts[extension] += 1
-                    
-            # 1. Insert into main commit_history table
-            cursor.execute("""
-                INSERT INTO commit_history (
-                    sha, url, branch, repository, repository_url,
-                    author, commit_date, commit_message,
-                    file_count, lines_added, lines_removed
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                ) ON CONFLICT (sha) DO UPDATE SET
-                    branch = EXCLUDED.branch,
-                    repository = EXCLUDED.repository,
-                    repository_url = EXCLUDED.repository_url,
-                    author = EXCLUDED.author,
-                    commit_date = EXCLUDED.commit_date,
-                    commit_message = EXCLUDED.commit_message,
-                    file_count = EXCLUDED.file_count,
-                    lines_added = EXCLUDED.lines_added,
-                    lines_removed = EXCLUDED.lines_removed
-            """, (
-                commit_data['sha'],
-                commit_data['html_url'],
-                branch,
-                repo_full_name,
-                repo_url,
-                author_name,
-                commit_data['commit']['committer']['date'],
-                commit_message,
-                len(files),
-                stats.get('additions', 0),
-                stats.get('deletions', 0)
-            ))
-
-            # 2. Insert into commit_branch_relationship
-            cursor.execute("""
-                INSERT INTO commit_branch_relationship (sha, branch)
-                VALUES (%s, %s)
-                ON CONFLICT (sha, branch) DO NOTHING
-            """, (sha, branch))
 
-            # 3. Insert into commit_directory (all unique directories)
-            for directory in directories:
-                cursor.execute("""
-                    INSERT INTO commit_directory (sha, directory)
-                    VALUES (%s, %s)
-                    ON CONFLICT (sha, directory) DO NOTHING
-                """, (sha, directory))
-
-            # 4. Insert into commit_file_types
-            for ext, count in extension_counts.items():
-                cursor.execute("""
-                        INSERT INTO commit_file_types (sha,file_extension,count)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (sha, file_extension) DO UPDATE SET
-                        count = EXCLUDED.count
-                    """, (sha, ext, count))
-
-            # 5. Insert into commit_message
-            for word in words:  # Using set() to store each word only once per commit
-                    cursor.execute("""
-                        INSERT INTO commit_message_words (sha, word)
-                        VALUES (%s, %s)
-                        ON CONFLICT (sha, word) DO NOTHING
-                    """, (sha, word))
-            
-            # 6. Process commit tags
             tags = extract_tags(commit_data['commit']['message'])
             if not tags:  
                 tags = ['No tag found']
 
-            for tag in tags:
-                    cursor.execute("""
-                        INSERT INTO commit_tags (sha, tags)
-                        VALUES (%s, %s)
-                        ON CONFLICT (sha, tags) DO NOTHING
-                    """, (sha, str(tag).lower()))
-
+            # scc already ran in scc_executor; never rescan on the event loop thread
+            if complexity is None:
+                try:
+                    complexity = load_cached_complexity(repo_full_name, sha)
+                except sqlite3.Error:
+                    complexity = {}
+            file_rows = []
+            cc_rows = {}
             for file in files:
                 if not isinstance(file, dict):
                     continue
@@ -369,12 +587,13 @@ def store_commit_data(conn, repo_full_name, repo_url, branch, commit_data):
                 try:
                     line_inserts = file.get('additions', 0)
                     line_deletes = file.get('deletions', 0)
+                    is_code = is_code_file(filename)
 
                     # Get language from filename first
                     language = get_language_from_filename(filename)
                     
                     # Skip SCC analysis for non-code files
-                    if not is_code_file(filename):
+                    if not is_code:
                         complexity_data = {
                             'Lines': 0,
                             'Code': 0,
@@ -383,25 +602,11 @@ def store_commit_data(conn, repo_full_name, repo_url, branch, commit_data):
                             'Language': language
                         }
                     else:
-                        complexity_data = get_complexity_with_scc(repo_full_name, sha, filename)
+                        complexity_data = dict(complexity.get(filename, {}))
                         # Ensure language is set even if SCC fails
                         complexity_data['Language'] = language
 
-                    # Insert into commit_files
-                    cursor.execute("""
-                        INSERT INTO commit_files (
-                            sha, filename, line_inserts, line_deletes,
-                            total_lines, total_code_lines, total_comment_lines, complexity
-                        ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s, %s
-                        ) ON CONFLICT (sha, filename) DO UPDATE SET
-                            line_inserts = EXCLUDED.line_inserts,
-                            line_deletes = EXCLUDED.line_deletes,
-                            total_lines = EXCLUDED.total_lines,
-                            total_code_lines = EXCLUDED.total_code_lines,
-                            total_comment_lines = EXCLUDED.total_comment_lines,
-                            complexity = EXCLUDED.complexity
-                    """, (
+                    file_rows.append((
                         sha,
                         filename,
                         line_inserts,
@@ -413,157 +618,224 @@ def store_commit_data(conn, repo_full_name, repo_url, branch, commit_data):
                     ))
 
                     # Only store complexity for code files
-                    if is_code_file(filename):
-                        cursor.execute("""
-                            INSERT INTO code_complexity_measurement (
-                                filename, language, total_code_lines, 
-                                total_comments, complexity
-                            ) VALUES (
-                                %s, %s, %s, %s, %s
-                            ) ON CONFLICT (filename) DO UPDATE SET
-                                language = EXCLUDED.language,
-                                total_code_lines = EXCLUDED.total_code_lines,
-                                total_comments = EXCLUDED.total_comments,
-                                complexity = EXCLUDED.complexity
-                        """, (
+                    if is_code:
+                        cc_rows[filename] = (
                             filename,
                             complexity_data.get('Language', language),
                             complexity_data.get('Code', 0),
                             complexity_data.get('Comment', 0),
                             complexity_data.get('Complexity', 0)
-                        ))
+                        )
                         
                 except Exception as e:
                     print(f"Error processing file {filename} in commit {sha}: {str(e)}")
                     continue
 
-        conn.commit()
-        return True
-    except Exception as e:
-            print(f"❌ Failed to store commit {sha}: {e}")
-            return False   
+            # Everything was extracted, so the commit can join the batch
+            self.commits[sha] = {
+                'history': [(
+                    commit_data['sha'],
+                    commit_data['html_url'],
+                    branch,
+                    repo_full_name,
+                    repo_url,
+                    author_name,
+                    commit_data['commit']['committer']['date'],
+                    commit_message,
+                    len(files),
+                    stats.get('additions', 0),
+                    stats.get('deletions', 0),
+                    list(dict.fromkeys(str(tag).lower() for tag in tags)),
+                    sorted(directories),
+                    Json(dict(extension_counts), dumps=json_dumps)
+                )],
+                'branches': [(sha, branch)],
+                'words': [(sha, word) for word in words],
+                'files': file_rows
+            }
+            self.cc_rows.update((filename, (sha, row)) for filename, row in cc_rows.items())
+            return True
+        except Exception as e:
+            print(f"❌ Failed to store commit {commit_data.get('sha', 'unknown')}: {e}")
+            return False
+
+    def flush(self, conn):
+        #Writing all buffered rows with one statement per table, returning the number of commits stored
+        if not len(self):
+            return 0
+        try:
+            with conn.cursor() as cursor:
+                # History is immutable and can be refetched, so the batch skips waiting on the WAL flush
+                cursor.execute("SET LOCAL synchronous_commit = OFF")
+                self.write_branch_rows(cursor, self.branch_rows)
+                self.write_rows(cursor, self.commits.values(), self.cc_rows.values())
+            conn.commit()
+            return len(self)
+        except Exception as e:
+            conn.rollback()
+            print(f"⚠️ Batch of {len(self)} commits failed, retrying one at a time: {e}")
+            return self.flush_each(conn)
+        finally:
+            self.clear()
+
+    def flush_each(self, conn):
+        #Writing the commits one by one behind savepoints, so a bad commit does not lose the whole batch
+        cc_by_sha = defaultdict(list)
+        for sha, row in self.cc_rows.values():
+            cc_by_sha[sha].append((sha, row))
+        stored = 0
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SET LOCAL synchronous_commit = OFF")
+                cursor.execute("SAVEPOINT commit_rows")
+                try:
+                    self.write_branch_rows(cursor, self.branch_rows)
+                    cursor.execute("RELEASE SAVEPOINT commit_rows")
+                    stored += len(self.branch_rows)
+                except psycopg2.Error as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT commit_rows")
+                    print(f"❌ Failed to store branch rows for {len(self.branch_rows)} known commits: {e}")
+                for sha, rows in self.commits.items():
+                    cursor.execute("SAVEPOINT commit_rows")
+                    try:
+                        self.write_rows(cursor, [rows], cc_by_sha[sha])
+                        cursor.execute("RELEASE SAVEPOINT commit_rows")
+                        stored += 1
+                    except psycopg2.Error as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT commit_rows")
+                        print(f"❌ Failed to store commit {sha}: {e}")
+            conn.commit()
+            return stored
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Failed to store batch of {len(self)} commits: {e}")
+            return 0
+
+    @staticmethod
+    def write_branch_rows(cursor, branch_rows):
+        #Writing the branch relationships of commits whose other rows are already stored
+        execute_values(cursor, """
+            INSERT INTO commit_branch_relationship (sha, branch)
+            VALUES %s
+            ON CONFLICT (sha, branch) DO NOTHING
+        """, sorted(branch_rows), page_size=1000)
+
+    @staticmethod
+    def write_rows(cursor, commits, cc_rows):
+        #Writing the rows of the given commits, one statement per table; cc_rows holds (sha, row) pairs
+        # Sorting by SHA keeps row locks in the same order across concurrent branches
+        commits = sorted(commits, key=lambda commit_rows: commit_rows['history'][0][0])
+
+        def rows_for(table):
+            return (row for commit_rows in commits for row in commit_rows[table])
+
+        # 1. Insert into main commit_history table
+        inserted = execute_values(cursor, """
+            INSERT INTO commit_history (
+                sha, url, branch, repository, repository_url,
+                author, commit_date, commit_message,
+                file_count, lines_added, lines_removed,
+                tags, directories, file_types
+            ) VALUES %s
+            ON CONFLICT (sha) DO UPDATE SET
+                branch = EXCLUDED.branch,
+                repository = EXCLUDED.repository,
+                repository_url = EXCLUDED.repository_url,
+                author = EXCLUDED.author,
+                commit_date = EXCLUDED.commit_date,
+                commit_message = EXCLUDED.commit_message,
+                file_count = EXCLUDED.file_count,
+                lines_added = EXCLUDED.lines_added,
+                lines_removed = EXCLUDED.lines_removed,
+                tags = EXCLUDED.tags,
+                directories = EXCLUDED.directories,
+                file_types = EXCLUDED.file_types
+            RETURNING sha, (xmax = 0) AS inserted
+        """, rows_for('history'), page_size=1000, fetch=True,
+            # Empty lists are sent as '{}', which needs the cast to be read as an array
+            template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::text[], %s::text[], %s::jsonb)")
+
+        # 2. Insert into commit_branch_relationship
+        execute_values(cursor, """
+            INSERT INTO commit_branch_relationship (sha, branch)
+            VALUES %s
+            ON CONFLICT (sha, branch) DO NOTHING
+        """, rows_for('branches'), page_size=1000)
+
+        # The remaining rows are per SHA, not per branch, so a commit already stored
+        # from another branch only needed its branch relationship above
+        new_shas = {sha for sha, is_new in inserted if is_new}
+        commits = [commit_rows for commit_rows in commits if commit_rows['history'][0][0] in new_shas]
+        if not commits:
+            return
+
+        # 3. Insert into commit_message_words through COPY, the largest table by far.
+        # Words are [a-z0-9]+ and shas are hex, so no TSV escaping is needed
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS tmp_words (sha TEXT, word TEXT) ON COMMIT DROP")
+        cursor.copy_from(
+            LineStream(f"{sha}\t{word}\n" for sha, word in rows_for('words')),
+            'tmp_words', columns=('sha', 'word')
+        )
+        cursor.execute("""
+            INSERT INTO commit_message_words (sha, word)
+            SELECT DISTINCT sha, word FROM tmp_words
+            ON CONFLICT (sha, word) DO NOTHING
+        """)
+        cursor.execute("TRUNCATE tmp_words")
+
+        # 4. Insert into commit_files
+        execute_values(cursor, """
+            INSERT INTO commit_files (
+                sha, filename, line_inserts, line_deletes,
+                total_lines, total_code_lines, total_comment_lines, complexity
+            ) VALUES %s
+            ON CONFLICT (sha, filename) DO UPDATE SET
+                line_inserts = EXCLUDED.line_inserts,
+                line_deletes = EXCLUDED.line_deletes,
+                total_lines = EXCLUDED.total_lines,
+                total_code_lines = EXCLUDED.total_code_lines,
+                total_comment_lines = EXCLUDED.total_comment_lines,
+                complexity = EXCLUDED.complexity
+        """, rows_for('files'), page_size=1000)
+
+        # 5. Complexity is stored per file path, for code files only
+        execute_values(cursor, """
+            INSERT INTO code_complexity_measurement (
+                filename, language, total_code_lines, 
+                total_comments, complexity
+            ) VALUES %s
+            ON CONFLICT (filename) DO UPDATE SET
+                language = EXCLUDED.language,
+                total_code_lines = EXCLUDED.total_code_lines,
+                total_comments = EXCLUDED.total_comments,
+                complexity = EXCLUDED.complexity
+        """, (row for sha, row in cc_rows if sha in new_shas), page_size=1000)
 
 def get_language_from_filename(filename: str) -> str:
     # Get the language from the filename
     if not filename or not isinstance(filename, str):
         return 'Unknown'
 
-    language_mapping = {
-        '.py': 'Python',
-        '.js': 'JavaScript',
-        '.ts': 'TypeScript',
-        '.java': 'Java',
-        '.go': 'Go',
-        '.rb': 'Ruby',
-        '.c': 'C',
-        '.h': 'C Header',
-        '.cpp': 'C++',
-        '.hpp': 'C++ Header',
-        '.cs': 'C#',
-        '.php': 'PHP',
-        '.swift': 'Swift',
-        '.kt': 'Kotlin',
-        '.scala': 'Scala',
-        '.rs': 'Rust',
-        '.sh': 'Shell Script',
-        '.pl': 'Perl',
-        '.r': 'R',
-        '.sql': 'SQL',
-        '.html': 'HTML',
-        '.css': 'CSS',
-        '.json': 'JSON',
-        '.yml': 'YAML',
-        '.yaml': 'YAML',
-        '.xml': 'XML',
-        '.md': 'Markdown',
-        '.txt': 'Text',
-        '.ps1': 'PowerShell',
-        '.soql': 'SOQL',
-        '.sosl': 'SOSL',
-        '.apex': 'Apex',
-        '.cls': 'Apex Class',
-        '.trigger': 'Apex Trigger',
-        '.page': 'Visualforce Page',
-        '.component': 'Visualforce Component',
-        '.dockerfile': 'Dockerfile',
-        '.tf': 'Terraform',
-        '.ini': 'INI',
-        '.properties': 'Properties',
-        '.gitignore': 'Git Ignore',
-        '.forceignore': 'Salesforce Ignore',
-        '.sfdx-project': 'Salesforce Config',
-        '.eslintrc': 'ESLint Config',
-        '.babelrc': 'Babel Config',
-        '.prettierrc': 'Prettier Config',
-        '.stylelintrc': 'Stylelint Config',
-        '.editorconfig': 'EditorConfig',
-        '.npmignore': 'NPM Ignore',
-        '.dockerignore': 'Docker Ignore',
-        '.gitattributes': 'Git Attributes',
-        '.tpl': 'Terraform Plan',
-        '.npmrc': 'NPM Config',
-        '.bin': 'Binary',
-        '.exe': 'Executable',
-        '.tsx': 'TypeScript JSX',
-        '.cjs': 'CommonJS',
-        '.email': 'Email',
-        'prettierignore': 'Prettier',
-        '.prettierignore': 'Prettier',
-    }
-    
-    special_files = {
-        'dockerfile': 'Docker',
-        'makefile': 'Make',
-        'gitignore': 'Git',
-        'forceignore': 'Salesforce',
-        '.forceignore': 'Salesforce',
-        '.gitignore': 'Git',
-        'prettierignore': 'Prettier',
-        '.prettierignore': 'Prettier',
-        'prettierrc': 'Prettier',
-        '.prettierrc': 'Prettier',
-        '.eslintrc': 'ESLint',
-        '.babelrc': 'Babel',
-        '.stylelintrc': 'Stylelint',
-        '.editorconfig': 'EditorConfig',
-        '.npmignore': 'NPM',
-        '.dockerignore': 'Docker',
-        '.gitattributes': 'Git',
-        '.npmrc': 'NPM',
-        'husky/pre-commit': 'Husky',
-        '.husky/pre-commit': 'Husky',
-        '.github/workflows': 'GitHub Actions'
-    }
-    
-    basename = os.path.basename(filename).lower()
     full_path = filename.lower()
+    basename = os.path.basename(full_path)
 
-    # 1. Check for special files by exact name match
-    if basename in special_files:
-        return special_files[basename]
-    
-    # 2. Check for special files with leading dot
-    if f".{basename}" in special_files:
-        return special_files[f".{basename}"]
+    # 1. Check for special files by exact name match, also with a leading dot
+    language = SPECIAL_FILES.get(basename) or SPECIAL_FILES.get(f".{basename}")
+    if language:
+        return language
     
-    # 3. Check for special paths (like husky/pre-commit)
-    for special_path in special_files:
+    # 2. Check for special paths (like husky/pre-commit)
+    for special_path in SPECIAL_PATHS:
         if special_path in full_path:
-            return special_files[special_path]
-
-    # 4. Standard extension processing
-    _, ext = os.path.splitext(filename.lower())
-    if ext in language_mapping:
-        return language_mapping[ext]
+            return SPECIAL_FILES[special_path]
 
-    return None    
+    # 3. Standard extension processing
+    _, ext = os.path.splitext(full_path)
+    return LANGUAGE_MAPPING.get(ext)
 
 def is_code_file(filename):
     #Checking if file should be analyzed with SCC
-    code_extensions = ['.py', '.js', '.ts', '.java', '.go', '.rb', '.php', 
-                    '.cpp', '.c', '.h', '.cs', '.swift', '.kt', '.scala',
-                    '.rs', '.sh', '.sql', '.html', '.css', '.json', '.yml']
-    return any(filename.endswith(ext) for ext in code_extensions)    
+    return os.path.splitext(filename)[1].lower() in CODE_EXTENSIONS
 
 def remove_readonly(path):
     #Removing readonly attributes from files and directories
@@ -588,77 +860,144 @@ def handle_remove_readonly(func, path):
         except Exception:
             pass
 
-def get_complexity_with_scc(repo_full_name, sha, filename):
-    #Analyzing the  file complexity using scc tool
-    if not filename or not isinstance(filename, str):
-        return {'Language': 'Unknown'}
-    temp_dir = os.path.join(os.getenv('TEMP', '/tmp'), f"repo_{sha[:7]}")
-    language = get_language_from_filename(filename)
+def get_repo_clone(repo_full_name):
+    #Returning the cached clone of the repository, cloning it on first use
+    repo_dir = os.path.join(REPO_CACHE_DIR, repo_full_name.replace('/', '_'))
+    with repo_lock:
+        if not os.path.isdir(os.path.join(repo_dir, '.git')):
+            os.makedirs(REPO_CACHE_DIR, exist_ok=True)
+            for _ in range(3):  # Retry up to 3 times
+                if os.path.exists(repo_dir):
+                    remove_readonly(repo_dir)
+                    shutil.rmtree(repo_dir, onexc=handle_remove_readonly)
+                try:
+                    subprocess.run([
+                        'git', 'clone', 
+                        f'https://github.com/{repo_full_name}.git',
+                        repo_dir
+                    ], check=True, capture_output=True, text=True, timeout=60)
+                    break
+                except subprocess.TimeoutExpired:
+                    print(f"Retrying clone for {repo_full_name}...")
+                    continue
+    return repo_dir
+
+def archive_files(repo_dir, sha, filenames):
+    #Reading the given files at sha out of the clone as a tar archive
+    command = ['git', '-C', repo_dir, 'archive', sha, '--', *filenames]
     try:
-        if os.path.exists(temp_dir):
-            remove_readonly(temp_dir)
-            shutil.rmtree(temp_dir, onexc=handle_remove_readonly)
-        
-        for _ in range(3):  # Retry up to 3 times
-            try:
-                subprocess.run([
-                    'git', 'clone', 
-                    f'https://github.com/{repo_full_name}.git',
-                    temp_dir
-                ], check=True, capture_output=True, text=True, timeout=60)
-                break
-            except subprocess.TimeoutExpired:
-                print(f"Retrying clone for {filename}...")
-                continue
-        subprocess.run([
-            'git', '-C', temp_dir, 'checkout', sha
-        ], check=True, capture_output=True, text=True)
-        
-        # Run scc on the specific file
-        file_path = os.path.join(temp_dir, filename)
-        if not os.path.exists(file_path):
-            return {'Language':language}
-            
-        result = subprocess.run([
-            'scc', '--format', 'json', file_path
-        ], capture_output=True, text=True, check=True)
-        
-        # Parse scc output
-        data = json.loads(result.stdout)
-        if data:
-            data[0]['Language'] = language  
-            return data[0]
-        return {'Language': language}
-        
+        return subprocess.run(command, check=True, capture_output=True).stdout
+    except subprocess.CalledProcessError:
+        # The commit is newer than the cached clone
+        with repo_lock:
+            subprocess.run([
+                'git', '-C', repo_dir, 'fetch', 'origin'
+            ], check=True, capture_output=True, text=True, timeout=300)
+        return subprocess.run(command, check=True, capture_output=True).stdout
+
+def code_files(commit_data):
+    #Listing the code files a commit added or changed, analyzed together in one scc run
+    return tuple(
+        file['filename'] for file in commit_data.get('files', [])
+        if isinstance(file, dict) and file.get('filename')
+        and file.get('status') != 'removed' and is_code_file(file['filename'])
+    )
+
+def get_scc_cache():
+    #Opening the on-disk scc cache on first use; shared by the scc worker threads
+    global scc_cache
+    if scc_cache is None:
+        scc_cache = sqlite3.connect(SCC_CACHE_PATH, check_same_thread=False)
+        scc_cache.execute("""
+            CREATE TABLE IF NOT EXISTS scc_cache (
+                repo TEXT NOT NULL,
+                sha TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                metrics TEXT NOT NULL,
+                PRIMARY KEY (repo, sha, filename)
+            )
+        """)
+        scc_cache.commit()
+    return scc_cache
+
+def load_cached_complexity(repo_full_name, sha):
+    #Reading every cached scc result for a commit
+    with scc_cache_lock:
+        rows = get_scc_cache().execute(
+            "SELECT filename, metrics FROM scc_cache WHERE repo = ? AND sha = ?",
+            (repo_full_name, sha)
+        ).fetchall()
+    return {filename: json_loads(metrics) for filename, metrics in rows}
+
+def save_cached_complexity(repo_full_name, sha, complexity):
+    #Storing scc results for a commit; a SHA's files never change, so entries never expire
+    with scc_cache_lock:
+        cache = get_scc_cache()
+        cache.executemany(
+            "INSERT OR REPLACE INTO scc_cache (repo, sha, filename, metrics) VALUES (?, ?, ?, ?)",
+            [(repo_full_name, sha, filename, json_dumps(metrics)) for filename, metrics in complexity.items()]
+        )
+        cache.commit()
+
+def get_commit_complexity(repo_full_name, sha, filenames):
+    #Analyzing the complexity of a commit's code files with a single scc run, keyed by filename
+    if not filenames:
+        return {}
+    try:
+        return scan_commit_complexity(repo_full_name, sha, filenames)
     except subprocess.CalledProcessError as e:
-        print(f"SCC analysis failed for {filename}: {e.stderr}")
-        return {'Language': language}   
+        print(f"SCC analysis failed for commit {sha}: {e.stderr}")
     except json.JSONDecodeError as e:
-        print(f"Invalid JSON from SCC for {filename}")
-        return {'Language': language}   
+        print(f"Invalid JSON from SCC for commit {sha}")
     except Exception as e:
         print(f"Error in complexity analysis: {e}")
-        return {'Language': language}
-    finally:
-        # Clean up temp directory
-        if os.path.exists(temp_dir):
-                remove_readonly(temp_dir)
-                for _ in range(3): 
-                    try:
-                        shutil.rmtree(temp_dir, onexc=handle_remove_readonly)
-                        break
-                    except Exception as e:
-                        print(f"Retrying cleanup of {temp_dir}: {e}")
-                        time.sleep(1)
+    # Failures are not memoized, so a later call for this commit retries; earlier results still count
+    try:
+        return load_cached_complexity(repo_full_name, sha)
+    except sqlite3.Error:
+        return {}
+
+@lru_cache(maxsize=256)
+def scan_commit_complexity(repo_full_name, sha, filenames):
+    #Running scc over the files not cached yet; raises on failure so only complete results are memoized
+    cached = load_cached_complexity(repo_full_name, sha)
+    missing = tuple(filename for filename in filenames if filename not in cached)
+    if not missing:
+        return cached
+    filenames = missing
+
+    repo_dir = get_repo_clone(repo_full_name)
+    archive = archive_files(repo_dir, sha, filenames)
+
+    # Only the touched files are extracted, so scc never walks the whole tree
+    with tempfile.TemporaryDirectory() as tree_dir:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(tree_dir, filter='data')
+        result = subprocess.run([
+            'scc', '--format', 'json', '--by-file', *filenames
+        ], cwd=tree_dir, capture_output=True, text=True, check=True)
+
+    # Parse scc output
+    complexity = {}
+    for language_summary in json_loads(result.stdout) or []:
+        for file_stats in language_summary.get('Files') or []:
+            filename = os.path.normpath(file_stats['Location']).replace(os.sep, '/')
+            complexity[filename] = file_stats
+
+    # Files scc did not report are cached as empty so they are not rescanned
+    save_cached_complexity(
+        repo_full_name, sha, {filename: complexity.get(filename, {}) for filename in filenames}
+    )
+    cached.update(complexity)
+    return cached
 
 def extract_tags(message):
     #Extracting tags from commit message
     if not message:
         return ['No tag found']
-    tags = re.findall(r'#(\w+)|tags?:?\s*(\d+)', message)
     cleaned_tags = []
-    for tag_pair in tags:
-        cleaned_tags.extend(t for t in tag_pair if t)
+    for match in TAG_RE.finditer(message):
+        cleaned_tags.extend(t for t in match.groups() if t)
     
     return cleaned_tags if cleaned_tags else ['No tag found']
    
@@ -667,22 +1006,32 @@ async def async_main():
     # repository details
     owner = github_owner
     repo = github_repo
-    branches = get_all_branches(owner, repo, token=GITHUB_TOKEN)
-    
-    #branches="build/QA" if you want to test with a specific branch
-    
-    print(f"Branches in {owner}/{repo}:")
-    # Print each branch on a new line
-    for branch in branches:
-        print(f"- {branch}")
    
-    async with aiohttp.ClientSession() as session:
+    if not ensure_commit_columns():
+        return
+
+    async with create_github_session() as session:
+        branches = await get_all_branches(session, owner, repo)
+        
+        #branches="build/QA" if you want to test with a specific branch
+        
+        print(f"Branches in {owner}/{repo}:")
+        # Print each branch on a new line
         for branch in branches:
-            print(f"\nFetching commit history for {owner}/{repo} (branch: {branch})...")
-            print()
-            success = await fetch_and_store_commits(owner, repo, branch)
-            if not success:
-                print(f"❌ Failed to process commits for {owner}/{repo} branch {branch}")
+            print(f"- {branch}")
+
+        # Branches are independent, so a few of them are processed at once
+        sem = asyncio.Semaphore(BRANCH_CONCURRENCY)
+
+        async def run(branch):
+            async with sem:
+                print(f"\nFetching commit history for {owner}/{repo} (branch: {branch})...")
+                success = await fetch_and_store_commits(session, owner, repo, branch)
+                if not success:
+                    print(f"❌ Failed to process commits for {owner}/{repo} branch {branch}")
+                return success
+
+        await asyncio.gather(*(run(branch) for branch in branches))
 def main():
     # Main entry point
     asyncio.run(async_main())
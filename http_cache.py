@@ -0,0 +1,81 @@
+import json
+import sqlite3
+import time
+from collections import namedtuple
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlencode
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+def json_loads(body: Union[str, bytes]) -> Any:
+    """Parse a JSON body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def json_dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+CachedResponse = namedtuple('CachedResponse', ['etag', 'body', 'fresh'])
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Build a stable cache key from a URL and its query parameters"""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+class ResponseCache:
+    """SQLite-backed cache of JSON response bodies with ETag revalidation"""
+
+    def __init__(self, path: str, expire_after: int = 300):
+        self.expire_after = expire_after
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                body TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def lookup(self, key: str, expire_after: Optional[int] = None) -> Optional[CachedResponse]:
+        """Return the cached body, its ETag and whether it is still within the TTL
+
+        expire_after overrides the cache-wide TTL for this lookup.
+        """
+        row = self.conn.execute(
+            "SELECT etag, body, fetched_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        etag, body, fetched_at = row
+        if expire_after is None:
+            expire_after = self.expire_after
+        return CachedResponse(etag, json_loads(body), time.time() - fetched_at < expire_after)
+
+    def store(self, key: str, body: Union[str, bytes], etag: Optional[str] = None):
+        """Store a raw JSON body as returned by the server"""
+        self.conn.execute("""
+            INSERT INTO responses (key, etag, body, fetched_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                etag = excluded.etag,
+                body = excluded.body,
+                fetched_at = excluded.fetched_at
+        """, (key, etag, body, time.time()))
+        self.conn.commit()
+
+    def refresh(self, key: str):
+        """Mark a cached body as fresh again after a 304 Not Modified"""
+        self.conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
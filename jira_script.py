@@ -1,16 +1,34 @@
+import asyncio
+import aiohttp
+import io
+import re
 import requests
-from datetime import datetime
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional
 import logging
 import time
 import sys
 from logging import StreamHandler
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extensions import connection as BaseConnection
+from psycopg2.pool import ThreadedConnectionPool
 import time
 import traceback
 import configparser
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from http_cache import ResponseCache, cache_key, json_dumps, json_loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it each search page is parsed whole
+    ijson = None
 
 class SafeStreamHandler(StreamHandler):
     #A stream handler which is used to handle Unicode characters on Windows
@@ -33,6 +51,224 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+HTTP_POOL_SIZE = 20
+CHANGED_FILES_WORKERS = 16  # stays below HTTP_POOL_SIZE so no worker waits for a connection
+GITHUB_REQUESTS_PER_MINUTE = 80  # keeps the threaded fetches under GitHub's 5000 requests an hour
+DB_CONNECT_RETRIES = 3
+DB_RETRY_BACKOFF = 0.5  # seconds before the second attempt, doubled after every failure
+FLUSH_INTERVAL = 500  # issues processed between database flushes
+ISSUE_CONCURRENCY = 20  # issues processed at once by process_issues
+# Find commits with GitHub's commit search; branches are scanned when search is unavailable.
+# Search only covers the default branch, so set this to False to match commits on every branch
+USE_COMMIT_SEARCH = True
+SEARCH_RESULT_LIMIT = 1000  # GitHub returns at most this many search results per query
+HTTP_CACHE_PATH = '.jira_cache.sqlite'  # shared with Contributors.py
+HTTP_CACHE_TTL = 3600  # seconds before the field schema or branch list is revalidated
+# Every issue field the store methods read, fetched together with the changelog
+ISSUE_FIELDS = "reporter,priority,issuetype,project,resolution,status,created,updated,description,parent,issuelinks"
+
+class TokenBucket:
+    #Thread-safe token bucket; acquire() blocks until a request may be sent
+    def __init__(self, per_minute: int, burst: int):
+        self.rate = per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def rate_limit_delay(status: int, headers) -> Optional[float]:
+    #Seconds until GitHub lifts a rate limit, or None when the response is not rate limited
+    if status not in (403, 429):
+        return None
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        # Secondary (abuse) limits say how long to wait
+        return int(retry_after)
+    if headers.get('X-RateLimit-Remaining') == '0':
+        reset = int(headers.get('X-RateLimit-Reset', time.time() + 60))
+        return max(reset - time.time(), 0) + 1
+    return None
+
+def create_http_session() -> requests.Session:
+    #Create a keep-alive session that retries transient HTTP failures
+    session = requests.Session()
+    retry = Retry(
+        total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+@lru_cache(maxsize=64)
+def split_path(keys: str) -> tuple:
+    #Split a dotted field path once; the same few paths are read for every issue
+    return tuple(keys.split('.'))
+
+@lru_cache(maxsize=1024)
+def key_pattern(jira_key: str) -> re.Pattern:
+    #Compile the case-insensitive matcher for a Jira key once per key
+    return re.compile(re.escape(jira_key), re.IGNORECASE)
+
+def commit_message(commit: Dict) -> str:
+    #Message of a GitHub commit object; the API always includes it, so index directly
+    try:
+        return commit['commit']['message']
+    except (KeyError, TypeError):
+        return ''
+
+def parse_jira_timestamp(value: Optional[str]) -> Optional[datetime]:
+    #Parse a Jira timestamp such as 2024-01-31T12:00:00.000+0000; None when missing or malformed
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except (TypeError, ValueError):
+        return None
+
+def payload_hash(record: tuple) -> str:
+    #Stable 16-byte digest of a row, as a bytea hex literal for COPY
+    return "\\x" + hashlib.blake2b(repr(record).encode(), digest_size=16).hexdigest()
+
+def copy_value(value) -> str:
+    #Render one value in COPY text format
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+# Tables loaded through COPY: table -> (columns, key)
+STAGED_TABLES = {
+    "jira_detail": ([
+        "jira_key", "priority", "created_date", "url", "summary", "reporter", "issue_type", "project",
+        "resolution", "points", "status_change_date", "payload_hash"
+    ], ["jira_key"]),
+    "jira_history": (["jira_key", "change_date", "field", "from_value", "current_stage"], ["jira_key", "change_date", "field"]),
+    "commit_jira": (["jira_key", "sha"], ["sha"]),
+    "jira_parent": (["jira_key", "parent_key", "parent_summary", "parent_type"], ["jira_key", "parent_key"]),
+    "jira_history_cache": (["jira_key", "last_updated"], ["jira_key"]),
+    "jira_issue_link": (["jira_key", "link_type", "link_key", "link_status", "link_priority", "issue_type"], ["jira_key"]),
+}
+# Staged rows replace every stored row of the given keys instead of skipping conflicts
+REPLACED_TABLES = {"jira_issue_link"}
+# Staged rows overwrite these columns of an existing row instead of being skipped
+UPDATED_COLUMNS = {
+    "jira_detail": [
+        "priority", "url", "summary", "reporter", "issue_type", "resolution", "points", "status_change_date",
+        "payload_hash"
+    ],
+    "jira_parent": ["parent_summary", "parent_type"],
+    "jira_history_cache": ["last_updated"],
+}
+
+# Tables whose payload_hash column alone decides whether a conflicting row changed
+HASHED_TABLES = {"jira_detail"}
+
+# Issue update time as of the last stored history, so unchanged issues skip the history rewrite
+JIRA_HISTORY_CACHE_DDL = """
+    CREATE TABLE IF NOT EXISTS jira_history_cache (
+        jira_key text PRIMARY KEY,
+        last_updated timestamptz NOT NULL
+    )
+"""
+JIRA_DETAIL_DDL = "ALTER TABLE jira_detail ADD COLUMN IF NOT EXISTS payload_hash bytea"
+
+def merge_statement(table: str, columns: List[str], key: List[str]) -> str:
+    #Build the statement that moves a staging table into its target table
+    # Rows go in key order so consecutive inserts land on the same index pages
+    column_list = ", ".join(columns)
+    if table in REPLACED_TABLES:
+        # $1 lists the keys being replaced; staged rows may also carry other keys
+        return f"""
+            WITH replaced AS (
+                DELETE FROM {table} WHERE {key[0]} = ANY($1::text[])
+            )
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM {table}_stage
+            ORDER BY {', '.join(key)}
+        """
+    if table in UPDATED_COLUMNS:
+        updated = UPDATED_COLUMNS[table]
+        # Rows whose values are unchanged are left alone instead of rewritten as dead tuples
+        if table in HASHED_TABLES:
+            changed = f"{table}.payload_hash IS DISTINCT FROM EXCLUDED.payload_hash"
+        else:
+            changed = (
+                f"({', '.join(f'{table}.{column}' for column in updated)})"
+                f" IS DISTINCT FROM ({', '.join(f'EXCLUDED.{column}' for column in updated)})"
+            )
+        conflict_action = (
+            "DO UPDATE SET " + ", ".join(f"{column} = EXCLUDED.{column}" for column in updated)
+            + f" WHERE {changed}"
+        )
+    else:
+        conflict_action = "DO NOTHING"
+    return f"""
+        INSERT INTO {table} ({column_list})
+        SELECT DISTINCT ON ({', '.join(key)}) {column_list} FROM {table}_stage
+        ORDER BY {', '.join(key)}
+        ON CONFLICT ({', '.join(key)}) {conflict_action}
+    """
+
+# Fixed-shape statements, planned once per connection
+PREPARED_STATEMENTS = {
+    f"merge_{table}": merge_statement(table, columns, key)
+    for table, (columns, key) in STAGED_TABLES.items()
+}
+
+def prepare_statements(cursor):
+    #Create the session's staging tables and PREPARE the statements that are not prepared yet
+    cursor.execute(JIRA_HISTORY_CACHE_DDL)
+    # ALTER TABLE locks jira_detail even when the column exists, so check the catalog first
+    cursor.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'jira_detail' AND column_name = 'payload_hash'
+    """)
+    if cursor.fetchone() is None:
+        cursor.execute(JIRA_DETAIL_DDL)
+    for table, (columns, _) in STAGED_TABLES.items():
+        # Kept for the whole session and emptied on commit, so the prepared merges stay valid
+        cursor.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {table}_stage ON COMMIT DELETE ROWS AS
+            SELECT {', '.join(columns)} FROM {table} WITH NO DATA
+        """)
+    cursor.execute("SELECT name FROM pg_prepared_statements")
+    prepared = {row[0] for row in cursor.fetchall()}
+    for name, statement in PREPARED_STATEMENTS.items():
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} AS {statement}")
+
+def merge_rows(cursor, table: str, rows: List[tuple], replaced_keys: Optional[List[str]] = None) -> int:
+    #COPY rows into the table's staging copy, then merge them with the prepared INSERT ... SELECT
+    columns, _ = STAGED_TABLES[table]
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(map(copy_value, row)) + "\n")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table}_stage ({', '.join(columns)}) FROM STDIN WITH (FORMAT text)", buffer)
+    if table in REPLACED_TABLES:
+        cursor.execute(f"EXECUTE merge_{table} (%s)", (replaced_keys,))
+    else:
+        cursor.execute(f"EXECUTE merge_{table}")
+    merged = cursor.rowcount
+    cursor.execute(f"TRUNCATE {table}_stage")
+    return merged
+
+class PreparedConnection(BaseConnection):
+    # Pooled connection that gets its staging tables and prepared statements on first use
+    prepared = False
+
 def load_config() -> configparser.ConfigParser:
     #Load configuration from .github_analyzer_config file
     config = configparser.ConfigParser()
@@ -59,6 +295,7 @@ class JiraGitHubIntegrator:
                 'repo': config.get('GITHUB', 'REPO'),
                 'owner': config.get('GITHUB', 'OWNER')
             }
+            self.owner_repo = f"{self.github_config['owner']}/{self.github_config['repo']}"
             
             # Jira configuration
             self.jira_config = {
@@ -78,6 +315,14 @@ class JiraGitHubIntegrator:
                     'port': config.get('DATABASE', 'PORT', fallback='5432')
                 }
             self.jira_config['base_url'] = self.jira_config['base_url'].rstrip('/')
+
+            # URLs built once; per-issue and per-commit URLs are filled in with %
+            base_url = self.jira_config['base_url']
+            self._jira_issue_tpl = f"{base_url}/rest/api/3/issue/%s"
+            self._jira_browse_tpl = f"{base_url}/browse/%s"
+            self._gh_repo_url = f"https://api.github.com/repos/{self.owner_repo}"
+            self._gh_commits_url = f"{self._gh_repo_url}/commits"
+            self._gh_branches_url = f"{self._gh_repo_url}/branches"
         
             self.jira_auth = (self.jira_config['email'], self.jira_config['token'])
             self.github_headers = {
@@ -85,9 +330,23 @@ class JiraGitHubIntegrator:
             "Accept": "application/vnd.github+json",
             "User-Agent": "Jira-GitHub-Integrator"
         }
+
+            # One pooled session per API, reused by every request
+            self.jira_session = create_http_session()
+            self.jira_session.auth = self.jira_auth
+            self.github_session = create_http_session()
+            self.github_bucket = TokenBucket(GITHUB_REQUESTS_PER_MINUTE, burst=CHANGED_FILES_WORKERS)
+            self.github_session.headers.update(self.github_headers)
+
+            # Jira field schema and story points field id, looked up once per run
+            self._field_cache = None
+            self.response_cache = ResponseCache(HTTP_CACHE_PATH, expire_after=HTTP_CACHE_TTL)
+
+            # Rows collected by the store methods until the next flush()
+            self._reset_pending()
             
             # Initialize database if configured
-            self.db_conn = None
+            self.db_pool = None
             if self.db_config:
                 self._init_db()
                 
@@ -95,48 +354,65 @@ class JiraGitHubIntegrator:
             logger.error(f"Configuration error: {e}")
             raise
     
-    def _init_db(self):
-        #Initialize PostgreSQL database connection
+    def close(self):
+        #Close the HTTP sessions and the database connection
+        self.jira_session.close()
+        self.github_session.close()
+        self.response_cache.close()
+        if self.db_pool and not self.db_pool.closed:
+            self.db_pool.closeall()
+
+    def _init_db(self) -> bool:
+        #Create the PostgreSQL connection pool and check that it can hand out a connection
         if not self.db_config:
             logger.warning("No database configuration provided")
             return False
         
-        max_retries = 3
-        for attempt in range(max_retries):
+        for attempt in range(DB_CONNECT_RETRIES):
             try:
-                # Close existing connection if it exists
-                if hasattr(self, 'db_conn') and self.db_conn:
-                    self.db_conn.close()
+                # Close existing pool if it exists
+                if self.db_pool and not self.db_pool.closed:
+                    self.db_pool.closeall()
                     
-                # Create new connection
-                self.db_conn = psycopg2.connect(
-                    host=self.db_config['host'],
-                    database=self.db_config['database'],
-                    user=self.db_config['user'],
-                    password=self.db_config['password'],
-                    connect_timeout=5
+                # Connections are opened lazily beyond minconn and shared by the batcher threads
+                self.db_pool = ThreadedConnectionPool(
+                    minconn=2, maxconn=8, connection_factory=PreparedConnection,
+                    connect_timeout=5, **self.db_config
                 )
                 
-                # Create a new cursor for verification
-                cursor = self.db_conn.cursor()
-                cursor.execute("SELECT 1")
-                result = cursor.fetchone()
-                cursor.close()
-                
-                #if result and result[0] == 1:
-                    #logger.info("✅ Database connection successful")
+                with self._conn() as conn, conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+                return True
                     
             except psycopg2.OperationalError as e:
+                # Only connection-level failures are worth retrying
                 logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
-                time.sleep(2)
+                if attempt + 1 < DB_CONNECT_RETRIES:
+                    time.sleep(DB_RETRY_BACKOFF * 2 ** attempt)
             except Exception as e:
                 logger.error(f"Unexpected error during connection: {e}")
-                if hasattr(self, 'db_conn') and self.db_conn:
-                    self.db_conn.close()
-                time.sleep(2)
-                logger.error("❌ Failed to establish database connection after retries")
+                break
+        if self.db_pool and not self.db_pool.closed:
+            self.db_pool.closeall()
+        self.db_pool = None
+        logger.error("❌ Failed to establish database connection after retries")
         return False
 
+    @contextmanager
+    def _conn(self):
+        #Borrow a pooled connection, preparing it on first use, and return it to the pool afterwards
+        conn = self.db_pool.getconn()
+        try:
+            if not conn.prepared:
+                with conn.cursor() as cursor:
+                    prepare_statements(cursor)
+                conn.commit()
+                conn.prepared = True
+            yield conn
+        finally:
+            self.db_pool.putconn(conn)
+
     def verify_connections(self) -> bool:
         #Verify all connections (Jira, GitHub, and DB if configured)
         jira_ok = self._verify_jira_connection()
@@ -145,14 +421,13 @@ class JiraGitHubIntegrator:
         # database connection verification
         db_ok = True
         if self.db_config:
-            if not self.db_conn or self.db_conn.closed != 0:
+            if not self.db_pool or self.db_pool.closed:
                 logger.warning("Database connection not active, attempting to reconnect...")
                 db_ok = self._init_db()
             else:
                 try:
-                    cursor = self.db_conn.cursor()
-                    cursor.execute("SELECT 1")
-                    cursor.close()
+                    with self._conn() as conn, conn.cursor() as cursor:
+                        cursor.execute("SELECT 1")
                     db_ok = True
                 except:
                     db_ok = False
@@ -166,7 +441,7 @@ class JiraGitHubIntegrator:
         #Verify Jira API connection
         try:
             url = f"{self.jira_config['base_url']}/rest/api/3/myself"
-            response = requests.get(url, auth=self.jira_auth, timeout=10)
+            response = self.jira_session.get(url, timeout=10)
             if response.status_code == 200:
                 logger.info("Jira connection successful")
                 return True
@@ -179,8 +454,8 @@ class JiraGitHubIntegrator:
     def _verify_github_connection(self) -> bool:
         #Verify GitHub API connection
         try:
-            url = f"https://api.github.com/repos/{self.github_config['owner']}/{self.github_config['repo']}"
-            response = requests.get(url, headers=self.github_headers, timeout=10)
+            url = self._gh_repo_url
+            response = self.github_session.get(url, timeout=10)
             if response.status_code == 200:
                 logger.info("GitHub connection successful")
                 return True
@@ -190,9 +465,8 @@ class JiraGitHubIntegrator:
             logger.error(f"GitHub connection error: {e}")
             return False
     
-    def _fetch_paginated_jira_data(self, endpoint: str, params: Dict) -> List[Dict]:
-        #Helper method to handle Jira API pagination
-        results = []
+    def _fetch_paginated_jira_data(self, endpoint: str, params: Dict) -> Iterator[Dict]:
+        #Helper method to handle Jira API pagination, yielding issues as they are parsed
         start_at = 0
         max_results = 100
         
@@ -204,33 +478,42 @@ class JiraGitHubIntegrator:
                     "maxResults": max_results
                 })
                 
-                response = requests.get(
+                with self.jira_session.get(
                     f"{self.jira_config['base_url']}{endpoint}",
-                    auth=self.jira_auth,
-                    params=current_params
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if 'issues' in data:
-                    results.extend(data['issues'])
-                
-                start_at += len(data.get('issues', []))
+                    params=current_params,
+                    stream=True
+                ) as response:
+                    response.raise_for_status()
+                    page_size = 0
+                    for issue in self._iter_page_issues(response):
+                        page_size += 1
+                        yield issue
                 
-                if start_at >= data.get('total', 0):
+                # The total comes after the issues in a streamed page, so stop on the first empty page
+                if not page_size:
                     break
+                start_at += page_size
                     
             except requests.exceptions.RequestException as e:
                 logger.error(f"Jira API error: {e}")
                 break
-                
-        return results
+
+    def _iter_page_issues(self, response: requests.Response) -> Iterator[Dict]:
+        #Parse the issues of one search page one at a time instead of loading the whole page
+        if ijson is None:
+            yield from json_loads(response.content).get('issues', [])
+            return
+        # Let urllib3 undo any gzip encoding before ijson reads the raw stream
+        response.raw.decode_content = True
+        yield from ijson.items(response.raw, 'issues.item')
         
-    def get_jira_issues(self, project: str, start_date: str, end_date: str) -> List[Dict]:
+    def get_jira_issues(self, project: str, start_date: str, end_date: str) -> Iterable[Dict]:
         #Retrieve Jira issues between specified dates
         try:
-            formatted_start = datetime.strptime(start_date, "%Y-%m-%d").strftime("%Y-%m-%d")
-            formatted_end = datetime.strptime(end_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+            # Only validates the dates; the strings are already in the format JQL expects
+            date.fromisoformat(start_date)
+            date.fromisoformat(end_date)
+            formatted_start, formatted_end = start_date, end_date
         except ValueError as e:
             logger.error(f"Invalid date format: {e}")
             return []
@@ -243,93 +526,177 @@ class JiraGitHubIntegrator:
         # ]
 
        
-        issues = self._fetch_paginated_jira_data(
+        # Search returns the same fields as _fetch_issue_full, so issues need no second request
+        try:
+            points_field_id = self._get_points_field_id()
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Couldn't fetch Jira field schema: {e}")
+            points_field_id = None
+        # Issues are yielded page by page as they arrive
+        return self._fetch_paginated_jira_data(
                 "/rest/api/3/search",
-                params={"expand": "changelog"}
+                params={
+                    "expand": "changelog",
+                    "fields": ISSUE_FIELDS + (f",{points_field_id}" if points_field_id else "")
+                }
             )
-        if issues:
-            return issues
-        
-        logger.warning("No issues found with any JQL variant")
-        return []
     
-    def get_github_commits_for_jira_key(self, jira_key: str) -> List[Dict]:
-        """Get GitHub commits from all branches referencing a specific Jira key"""
-        all_commits = []
-        seen_shas = set()
+    def _cached_get(self, session: requests.Session, url: str, params: Optional[Dict] = None):
+        #GET a rarely changing resource through the response cache, revalidating stale entries by ETag
+        key = cache_key(url, params)
+        cached = self.response_cache.lookup(key)
+        if cached and cached.fresh:
+            return cached.body
+
+        headers = {"If-None-Match": cached.etag} if cached and cached.etag else None
+        response = session.get(url, params=params, headers=headers, timeout=10)
+        if response.status_code == 304 and cached:
+            self.response_cache.refresh(key)
+            return cached.body
+        response.raise_for_status()
+        self.response_cache.store(key, response.content, response.headers.get("ETag"))
+        return json_loads(response.content)
 
+    def get_branches(self) -> Optional[List[str]]:
+        #Get the names of all branches, or None when GitHub cannot be reached
         try:
-            # Get all branches
-            branches_url = f"https://api.github.com/repos/{self.github_config['owner']}/{self.github_config['repo']}/branches"
-            branches_response = requests.get(branches_url, headers=self.github_headers)
-            branches_response.raise_for_status()
-            branches = [b['name'] for b in branches_response.json()]
+            return [b['name'] for b in self._cached_get(self.github_session, self._gh_branches_url)]
         except Exception as e:
             logger.error(f"Failed to fetch branches: {e}")
+            return None
+
+    def get_github_commits_for_jira_key(self, jira_key: str) -> List[Dict]:
+        """Get GitHub commits from all branches referencing a specific Jira key"""
+        branches = self.get_branches()
+        if branches is None:
             return []
+        return asyncio.run(self._find_commits_for_key(branches, jira_key))
 
-        for branch in branches:
-            page = 1
-            while True:
-                try:
-                    commits_url = f"https://api.github.com/repos/{self.github_config['owner']}/{self.github_config['repo']}/commits"
-                    params = {
-                        "sha": branch,
-                        "per_page": 100,
-                        "page": page
-                    }
-                    response = requests.get(commits_url, headers=self.github_headers, params=params)
-                    response.raise_for_status()
-                    commits = response.json()
-
-                    if not commits:
-                        break
-
-                    for commit in commits:
-                        sha = commit.get('sha')
-                        if sha in seen_shas:
-                            continue
-                            
-                        message = commit.get('commit', {}).get('message', '')
-                        if jira_key.lower() in message.lower():
-                            all_commits.append(commit)
-                            seen_shas.add(sha)
-
-                        author_name = None
-                        if commit.get('author') and commit['author'].get('login'):
-                            author_name = commit['author']['login']
-                        elif commit.get('commit', {}).get('author', {}).get('name'):
-                            author_name = commit['commit']['author']['name']
-                    if len(commits) < 100:
-                        break
-                        
-                    page += 1
-
-                except requests.exceptions.RequestException as e:
-                    logger.error(f"Error fetching commits from {branch}: {e}")
-                    break
+    def _create_github_client(self) -> aiohttp.ClientSession:
+        #Create the aiohttp session shared by concurrent GitHub requests
+        connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE)
+        return aiohttp.ClientSession(headers=self.github_headers, connector=connector)
+
+    async def _find_commits_for_key(self, branches: List[str], jira_key: str) -> List[Dict]:
+        #Look up the commits of a single Jira key over a session of its own
+        async with self._create_github_client() as session:
+            return await self._find_commits(session, branches, jira_key)
+
+    async def _find_commits(self, session: aiohttp.ClientSession, branches: List[str], jira_key: str) -> List[Dict]:
+        #Find the commits referencing a Jira key, keeping each commit once
+        found = await self._search_commits(session, jira_key) if USE_COMMIT_SEARCH else None
+        if found is None:
+            # Fall back to fetching the matching commits of every branch concurrently
+            found = [
+                commit
+                for branch_commits in await asyncio.gather(*(
+                    self._fetch_branch_commits(session, branch, jira_key) for branch in branches
+                ))
+                for commit in branch_commits
+            ]
+
+        all_commits = []
+        seen_shas = set()
+        for commit in found:
+            sha = commit.get('sha')
+            if sha in seen_shas:
+                continue
+            all_commits.append(commit)
+            seen_shas.add(sha)
 
         logger.info(f"Found {len(all_commits)} commits referencing {jira_key}")
         return all_commits
-    
+
+    async def _search_commits(self, session: aiohttp.ClientSession, jira_key: str) -> Optional[List[Dict]]:
+        #Search the repository's commits for the Jira key; None when commit search is unavailable
+        search_url = "https://api.github.com/search/commits"
+        params = {
+            "q": f"{jira_key} repo:{self.owner_repo}",
+            "per_page": 100,
+            "page": 1
+        }
+        headers = {"Accept": "application/vnd.github.cloak-preview+json"}
+        pattern = key_pattern(jira_key)
+        matching = []
+        while True:
+            try:
+                async with session.get(search_url, params=params, headers=headers) as response:
+                    if response.status in (404, 422):
+                        return None
+                    # The search API has its own, much lower, per-minute limit
+                    if await self._wait_for_rate_limit(response):
+                        continue
+                    response.raise_for_status()
+                    data = json_loads(await response.read())
+            except (aiohttp.ClientError, ValueError) as e:
+                logger.warning(f"Commit search failed for {jira_key}, scanning branches instead: {e}")
+                return None
+
+            items = data.get('items', [])
+            # Search matches whole words, so keep the same substring check as the branch scan
+            matching.extend(
+                item for item in items
+                if pattern.search(commit_message(item))
+            )
+            fetched = params["page"] * params["per_page"]
+            if len(items) < params["per_page"] or fetched >= min(data.get('total_count', 0), SEARCH_RESULT_LIMIT):
+                return matching
+            params["page"] += 1
+
+    async def _wait_for_rate_limit(self, response: aiohttp.ClientResponse) -> bool:
+        #Sleep until GitHub lifts a rate limit; True when the request should be retried
+        delay = rate_limit_delay(response.status, response.headers)
+        if delay is None:
+            return False
+        logger.warning(f"GitHub rate limit hit, retrying in {delay:.0f}s")
+        await asyncio.sleep(delay)
+        return True
+
+    async def _fetch_branch_commits(self, session: aiohttp.ClientSession, branch: str, jira_key: str) -> List[Dict]:
+        #Page through one branch, keeping the commits whose message mentions the Jira key
+        pattern = key_pattern(jira_key)
+        matching = []
+        commits_url = self._gh_commits_url
+        base_params = {"sha": branch, "per_page": 100}
+        page = 1
+        while True:
+            try:
+                async with session.get(commits_url, params={"page": page, **base_params}) as response:
+                    if await self._wait_for_rate_limit(response):
+                        continue
+                    response.raise_for_status()
+                    commits = json_loads(await response.read())
+
+                if not commits:
+                    break
+
+                matching.extend(commit for commit in commits if pattern.search(commit_message(commit)))
+
+                if len(commits) < 100:
+                    break
+                    
+                page += 1
+
+            except (aiohttp.ClientError, ValueError) as e:
+                logger.error(f"Error fetching commits from {branch}: {e}")
+                break
+
+        return matching
+
     def safe_get(self,dct: Dict, keys: str, default=None):
-        
-        try:
-            for key in keys.split('.'):
-                dct = dct.get(key, {}) if isinstance(dct, dict) else {}
-            return dct if dct != {} else default
-        except Exception:
-            return default
+        #Follow a dotted path through nested dicts, returning default when any part is missing
+        for key in split_path(keys):
+            if not isinstance(dct, dict):
+                return default
+            dct = dct.get(key, {})
+        return dct if dct != {} else default
     
     
-    def _get_jira_issue_details(self, jira_key: str) -> Optional[Dict]:
-        #Fetch Jira issue details with comprehensive error handling
-        try:
-            # First get the field schema to identify custom fields
+    def _get_points_field_id(self) -> Optional[str]:
+        #Identify the story points field; the field schema is fetched once and cached
+        if self._field_cache is None:
             fields_url = f"{self.jira_config['base_url']}/rest/api/3/field"
-            fields_response = requests.get(fields_url, auth=self.jira_auth, timeout=10)
-            fields_response.raise_for_status()
-            all_fields = fields_response.json()
+            all_fields = self._cached_get(self.jira_session, fields_url)
 
             # Identify custom fields by name patterns
             points_field_id = next(
@@ -337,21 +704,38 @@ class JiraGitHubIntegrator:
                 if 'point' in f['name'].lower() or 'story' in f['name'].lower()),
                 None
             )
+            self._field_cache = (all_fields, points_field_id)
+        return self._field_cache[1]
 
-            # Get issue details with expanded fields
-            issue_url = f"{self.jira_config['base_url']}/rest/api/3/issue/{jira_key}"
+    def _fetch_issue_full(self, jira_key: str) -> Optional[Dict]:
+        #Fetch an issue with every field the store methods need and its changelog in one request
+        try:
+            points_field_id = self._get_points_field_id()
+            issue_url = self._jira_issue_tpl % jira_key
             params = {
-                'expand': 'names,renderedFields',
-                'fields': f'reporter,priority,issuetype,project,resolution,status,created,updated{"," + points_field_id if points_field_id else ""}'
+                'expand': 'changelog',
+                'fields': ISSUE_FIELDS + (f",{points_field_id}" if points_field_id else "")
             }
-            
-            issue_response = requests.get(issue_url, auth=self.jira_auth, params=params, timeout=15)
+            issue_response = self.jira_session.get(issue_url, params=params, timeout=15)
             issue_response.raise_for_status()
-            issue_data = issue_response.json()
+            issue_data = json_loads(issue_response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Jira API request failed for {jira_key}: {str(e)}")
+            return None
 
-            if not issue_data or not isinstance(issue_data.get('fields'), dict):
-                logger.error(f"Invalid Jira response structure for {jira_key}")
+        if not issue_data or not isinstance(issue_data.get('fields'), dict):
+            logger.error(f"Invalid Jira response structure for {jira_key}")
+            return None
+        return issue_data
+
+    def _get_jira_issue_details(self, jira_key: str, issue_data: Optional[Dict] = None) -> Optional[Dict]:
+        #Extract Jira issue details from the issue, fetching it if it was not passed in
+        try:
+            if issue_data is None:
+                issue_data = self._fetch_issue_full(jira_key)
+            if not issue_data:
                 return None
+            points_field_id = self._get_points_field_id()
 
             fields = issue_data['fields']
 
@@ -392,20 +776,12 @@ class JiraGitHubIntegrator:
         return None
             
     
-    def store_jira_parent_relationships(self, jira_key: str) -> int:
-        #Store parent relationships in the database
+    def store_jira_parent_relationships(self, jira_key: str, issue_data: Optional[Dict] = None) -> int:
+        #Queue parent relationships for the next flush
         try:
-            # Verify database connection
-            if not self.db_conn or self.db_conn.closed != 0:
-                if not self._init_db():
-                    logger.error("Cannot store relationships - no database connection")
-                    return 0
-
-            # Fetch issue details including parent from Jira API
-            url = f"{self.jira_config['base_url']}/rest/api/3/issue/{jira_key}?fields=parent,issuelinks"
-            response = requests.get(url, auth=self.jira_auth, timeout=15)
-            response.raise_for_status()
-            issue_data = response.json()
+            # Fetch issue details including parent from Jira API unless already fetched
+            if issue_data is None:
+                issue_data = self._fetch_issue_full(jira_key)
 
             if not issue_data or not isinstance(issue_data.get('fields'), dict):
                 logger.warning(f"No valid data found for {jira_key}")
@@ -451,54 +827,24 @@ class JiraGitHubIntegrator:
                 logger.debug(f"No parent relationships found for {jira_key}")
                 return 0
 
-            # Insert records
-            with self.db_conn.cursor() as cursor:
-                cursor.executemany("""
-                    INSERT INTO jira_parent (
-                        jira_key, parent_key, parent_summary, parent_type
-                    ) VALUES (%s, %s, %s, %s)
-                    ON CONFLICT (jira_key, parent_key) DO UPDATE SET
-                        parent_summary = EXCLUDED.parent_summary,
-                        parent_type = EXCLUDED.parent_type
-                """, parent_records)
-
-                inserted_count = cursor.rowcount
-                self.db_conn.commit()
-                logger.info(f"Stored {inserted_count} parent relationships for {jira_key}")
-                return inserted_count
+            self._pending_parent.setdefault(jira_key, []).extend(parent_records)
+            logger.info(f"Queued {len(parent_records)} parent relationships for {jira_key}")
+            return len(parent_records)
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Jira API error for {jira_key} parent: {str(e)}")
         except Exception as e:
-            if self.db_conn:
-                self.db_conn.rollback()
-            logger.error(f"Database error storing {jira_key} parent: {str(e)}")
+            logger.error(f"Error collecting {jira_key} parent: {str(e)}")
         return 0
     
-    def store_jira_issue_links(self, jira_key: str) -> int:
-        #Store Jira issue links in the database
+    def store_jira_issue_links(self, jira_key: str, issue_data: Optional[Dict] = None) -> int:
+        #Queue Jira issue links for the next flush
         try:
-            # First get the issue type for this issue
-            issue_type = ''
-            try:
-                issue_url = f"{self.jira_config['base_url']}/rest/api/3/issue/{jira_key}?fields=issuetype"
-                issue_response = requests.get(issue_url, auth=self.jira_auth, timeout=10)
-                issue_response.raise_for_status()
-                issue_data = issue_response.json()
-                issue_type = self.safe_get(issue_data, 'fields.issuetype.name', '') or ''
-            except Exception as e:
-                logger.warning(f"Couldn't fetch issue type for {jira_key}: {str(e)}")
-
-            # Fetch issue links from Jira API
-            url = f"{self.jira_config['base_url']}/rest/api/3/issue/{jira_key}"
-            params = {
-                'fields': 'issuelinks',
-                'expand': 'fields.issuelinks'
-            }
-            
-            response = requests.get(url, auth=self.jira_auth, params=params, timeout=15)
-            response.raise_for_status()
-            issue_data = response.json()
+            # Fetch the issue type and issue links from Jira API unless already fetched
+            if issue_data is None:
+                issue_data = self._fetch_issue_full(jira_key)
+            if not issue_data:
+                logger.warning(f"No valid data found for {jira_key}")
+                return 0
+            issue_type = self.safe_get(issue_data, 'fields.issuetype.name', '') or ''
 
             link_records = []
 
@@ -537,47 +883,28 @@ class JiraGitHubIntegrator:
                         logger.warning(f"Error processing link for {jira_key}: {str(e)}")
                         continue
 
-            # Insert into the database
-            with self.db_conn.cursor() as cursor:
-                # First delete any existing links for this issue
-                cursor.execute("""
-                    DELETE FROM jira_issue_link WHERE jira_key = %s
-                """, (jira_key,))
-                
-                if not link_records:
-                    link_records.append((
-                        jira_key,
-                        '',  # link_type
-                        '',  # link_key
-                        '',  # link_status
-                        '',  # link_priority
-                        issue_type  # issue_type
-                    ))
-                
-                # Now insert all current links
-                execute_batch(cursor, """
-                    INSERT INTO jira_issue_link (
-                        jira_key, link_type, link_key, 
-                        link_status, link_priority, issue_type
-                    ) VALUES (%s, %s, %s, %s, %s, %s)
-                """, link_records)
-
-                inserted_count = len(link_records)
-                self.db_conn.commit()
-                logger.info(f"Stored {inserted_count} issue links for {jira_key}")
-                return inserted_count
+            if not link_records:
+                link_records.append((
+                    jira_key,
+                    '',  # link_type
+                    '',  # link_key
+                    '',  # link_status
+                    '',  # link_priority
+                    issue_type  # issue_type
+                ))
+
+            # flush() replaces the existing links of this issue with these
+            self._pending_links[jira_key] = link_records
+            logger.info(f"Queued {len(link_records)} issue links for {jira_key}")
+            return len(link_records)
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Jira API error for {jira_key} issue links: {str(e)}")
         except Exception as e:
-            if self.db_conn:
-                self.db_conn.rollback()
-            logger.error(f"Database error storing {jira_key} issue links: {str(e)}")
+            logger.error(f"Error collecting {jira_key} issue links: {str(e)}")
             logger.error(f"Traceback: {traceback.format_exc()}")
         return 0
 
-    def store_commit_jira_mappings(self, jira_key: str, commits: List[Dict]) -> int:
-        #Store the mappings of commits to Jira issues in the database
+    def store_commit_jira_mappings(self, jira_key: str, commits: List[Dict], issue_data: Optional[Dict] = None) -> int:
+        #Queue the mappings of commits to Jira issues for the next flush
         try:
             # data for all tables
             commit_records = []
@@ -596,73 +923,286 @@ class JiraGitHubIntegrator:
                 logger.warning(f"No valid commits for {jira_key}")
                 return 0
             
-            with self.db_conn.cursor() as cursor:
-                if commit_records:
-                    cursor.executemany("""
-                        INSERT INTO commit_jira (jira_key, sha)
-                        VALUES (%s, %s)
-                        ON CONFLICT (sha) DO NOTHING
-                    """, commit_records)
-
-                # calling parent relationships
-                self.store_jira_parent_relationships(jira_key)
-                # calling issue links
-                links_stored = self.store_jira_issue_links(jira_key)
-                if links_stored == 0:
-                    logger.warning(f"No issue links were stored for {jira_key} - this might be normal if no links exist")
-                self.db_conn.commit()
-                logger.info(f"Stored {len(commit_records)} commits and relationships for {jira_key}")
-                return len(commit_records)
+            self._pending_commit_jira.extend(commit_records)
+
+            # calling parent relationships
+            self.store_jira_parent_relationships(jira_key, issue_data)
+            # calling issue links
+            links_stored = self.store_jira_issue_links(jira_key, issue_data)
+            if links_stored == 0:
+                logger.warning(f"No issue links were stored for {jira_key} - this might be normal if no links exist")
+            logger.info(f"Queued {len(commit_records)} commits and relationships for {jira_key}")
+            return len(commit_records)
 
         except Exception as e:
-            if self.db_conn:
-                self.db_conn.rollback()
-            logger.error(f"Failed to store data for {jira_key}: {str(e)}")
+            logger.error(f"Failed to collect data for {jira_key}: {str(e)}")
             return 0
 
-    def store_single_jira_history(self, jira_key: str):
-        url = f"{self.jira_config['base_url']}/rest/api/3/issue/{jira_key}/changelog"
+    async def process_issues(self, issues: Iterable[Dict]) -> bool:
+        #Process issues concurrently as they stream in; False when a periodic flush failed to write its rows
+        branches = self.get_branches()
+        if branches is None:
+            branches = []
+        processed = 0
+        flushed = True
+        flush_lock = asyncio.Lock()  # one flush at a time, in the order the buffers were taken
+        history_updated = self._load_history_cache()
+
+        async def process_issue(session: aiohttp.ClientSession, issue: Dict):
+            nonlocal processed, flushed
+            jira_key = issue.get('key')
+            if not jira_key:
+                return
+            # The search result already holds the details, links, parent and changelog
+            issue_data = issue
+            if not isinstance(issue.get('fields'), dict):
+                issue_data = await loop.run_in_executor(None, self._fetch_issue_full, jira_key)
+            if not issue_data:
+                return
+            commits = await self._find_commits(session, branches, jira_key)
+
+            # Blocking Jira requests run in the executor; rows are queued on the event loop thread, which also swaps the buffers out for flushing
+            updated = parse_jira_timestamp(issue_data['fields'].get('updated'))
+            if updated is None or history_updated.get(jira_key) != updated:
+                try:
+                    histories = await loop.run_in_executor(None, self._get_changelog, jira_key, issue_data)
+                except Exception as e:
+                    logger.error(f"Failed to collect history for {jira_key}: {str(e)}")
+                else:
+                    if self.store_single_jira_history(jira_key, issue_data, histories) and updated:
+                        self._pending_history_seen.append((jira_key, updated))
+            self.store_jira_details_only(jira_key, issue_data)
+            if commits and self.db_config:
+                stored = self.store_commit_jira_mappings(jira_key, commits, issue_data)
+                logger.info(f"Stored {stored} commits for {jira_key}")
+            processed += 1
+            if processed % FLUSH_INTERVAL == 0:
+                pending = self._take_pending()
+                async with flush_lock:
+                    if not await loop.run_in_executor(None, self._flush_pending, pending):
+                        flushed = False
+
+        def report(done):
+            for task in done:
+                if task.exception():
+                    logger.error(f"Failed to process {running.pop(task)}: {task.exception()}")
+                else:
+                    running.pop(task)
+
+        loop = asyncio.get_running_loop()
+        issues = iter(issues)
+        running = {}  # task -> jira key
+        async with self._create_github_client() as session:
+            while True:
+                # Reading the next issue may download and parse a page, so keep it off the event loop thread
+                issue = await loop.run_in_executor(None, next, issues, None)
+                if issue is None:
+                    break
+                if len(running) >= ISSUE_CONCURRENCY:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    report(done)
+                running[asyncio.ensure_future(process_issue(session, issue))] = issue.get('key')
+            if running:
+                done, _ = await asyncio.wait(running)
+                report(done)
+
+        if processed:
+            logger.info(f"Processed {processed} Jira issues")
+        else:
+            logger.warning("No issues found with any JQL variant")
+        return flushed
+
+    def _load_history_cache(self) -> Dict[str, datetime]:
+        #Update time of every issue as of its last stored history
+        if not self.db_pool:
+            return {}
+        try:
+            with self._conn() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT jira_key, last_updated FROM jira_history_cache")
+                return dict(cursor.fetchall())
+        except psycopg2.Error as e:
+            logger.warning(f"Couldn't load the history cache, rewriting all history: {e}")
+            return {}
+
+    def _reset_pending(self):
+        #Start empty buffers for the store methods
+        self._pending_details = {}  # jira_key -> jira_detail row; the latest fetch wins
+        self._pending_history = []
+        self._pending_history_seen = []  # (jira_key, updated) of issues whose history was queued
+        self._pending_commit_jira = []
+        self._pending_parent = {}  # jira_key -> parent records found on that issue
+        self._pending_links = {}  # jira_key -> links; a key's stored links are replaced as a whole
+
+    def _take_pending(self) -> Dict:
+        #Hand over the queued rows and start new buffers
+        pending = {
+            "details": self._pending_details,
+            "history": self._pending_history,
+            "history_seen": self._pending_history_seen,
+            "commit_jira": self._pending_commit_jira,
+            "parent": self._pending_parent,
+            "links": self._pending_links,
+        }
+        self._reset_pending()
+        return pending
+
+    @staticmethod
+    def _split_pending(pending: Dict) -> Dict[str, Dict]:
+        #Regroup queued rows per issue so a failed issue can be skipped on its own
+        by_issue = {}
+
+        def issue(jira_key):
+            return by_issue.setdefault(jira_key, {
+                "details": {}, "history": [], "history_seen": [], "commit_jira": [], "parent": {}, "links": {}
+            })
+
+        for name in ("details", "parent", "links"):
+            for jira_key, value in pending[name].items():
+                issue(jira_key)[name][jira_key] = value
+        for name in ("history", "history_seen", "commit_jira"):
+            for row in pending[name]:
+                issue(row[0])[name].append(row)
+        return by_issue
+
+    @staticmethod
+    def _write_pending(cursor, pending: Dict):
+        #Merge the queued rows with one statement per table
+        if pending["details"]:
+            merge_rows(cursor, "jira_detail", list(pending["details"].values()))
+
+        if pending["history"]:
+            merge_rows(cursor, "jira_history", pending["history"])
+
+        if pending["history_seen"]:
+            # Committed with the history rows, so the cache never runs ahead of them
+            merge_rows(cursor, "jira_history_cache", pending["history_seen"])
+
+        if pending["commit_jira"]:
+            merge_rows(cursor, "commit_jira", pending["commit_jira"])
+
+        if pending["parent"]:
+            # One statement can update a row only once, so keep the last record per pair
+            parent_records = list({
+                record[:2]: record for records in pending["parent"].values() for record in records
+            }.values())
+            merge_rows(cursor, "jira_parent", parent_records)
+
+        if pending["links"]:
+            # Replaces the stored links of these issues with the current ones
+            merge_rows(
+                cursor, "jira_issue_link",
+                [record for records in pending["links"].values() for record in records],
+                replaced_keys=list(pending["links"])
+            )
+
+    def _write_each(self, conn, pending: Dict) -> int:
+        #Write the queued rows issue by issue, skipping only the issues that fail
+        failed = 0
+        with conn.cursor() as cursor:
+            cursor.execute("SET LOCAL synchronous_commit = off")
+            for jira_key, rows in self._split_pending(pending).items():
+                cursor.execute("SAVEPOINT issue_rows")
+                try:
+                    self._write_pending(cursor, rows)
+                    cursor.execute("RELEASE SAVEPOINT issue_rows")
+                except psycopg2.Error as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT issue_rows")
+                    logger.error(f"Skipping rows of {jira_key}: {str(e)}")
+                    failed += 1
+        conn.commit()
+        return failed
+
+    def flush(self) -> bool:
+        #Write every queued row with one statement per table and a single commit
+        return self._flush_pending(self._take_pending())
+
+    def _flush_pending(self, pending: Dict) -> bool:
+        #Write rows handed over by _take_pending, replaying per issue if the batch fails
+        try:
+            if not self.db_pool or self.db_pool.closed:
+                if not self._init_db():
+                    logger.error("Cannot flush - no database connection")
+                    return False
+
+            with self._conn() as conn:
+                try:
+                    with conn.cursor() as cursor:
+                        # Every row is re-derived from Jira on the next run, so skip waiting for the WAL fsync
+                        cursor.execute("SET LOCAL synchronous_commit = off")
+                        self._write_pending(cursor, pending)
+                    conn.commit()
+                except psycopg2.Error as e:
+                    conn.rollback()
+                    logger.warning(f"Batch flush failed, retrying one issue at a time: {str(e)}")
+                    try:
+                        failed = self._write_each(conn, pending)
+                    except Exception:
+                        conn.rollback()
+                        raise
+                    if failed:
+                        logger.error(f"Dropped the rows of {failed} issues that could not be written")
+                except Exception:
+                    conn.rollback()
+                    raise
+
+            logger.info(
+                f"Flushed {len(pending['details'])} issue details, {len(pending['history'])} history rows, {len(pending['commit_jira'])} commit mappings, "
+                f"parent relationships of {len(pending['parent'])} issues and links for {len(pending['links'])} issues"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to flush pending rows: {str(e)}")
+            return False
+
+    def _get_changelog(self, jira_key: str, issue_data: Optional[Dict]) -> List[Dict]:
+        #Return the change histories, using the expanded changelog when it holds all of them
+        changelog = (issue_data or {}).get('changelog') or {}
+        histories = changelog.get('histories')
+        if isinstance(histories, list) and len(histories) >= changelog.get('total', 0):
+            return histories
+
+        url = f"{self._jira_issue_tpl % jira_key}/changelog"
+        response = self.jira_session.get(url, timeout=15)
+        response.raise_for_status()
+        changelog_data = json_loads(response.content)
+        if changelog_data and isinstance(changelog_data.get('values'), list):
+            return changelog_data['values']
+        return []
+
+    def store_single_jira_history(self, jira_key: str, issue_data: Optional[Dict] = None,
+                                  histories: Optional[List[Dict]] = None) -> bool:
         try:
-            response = requests.get(url, auth=self.jira_auth, timeout=15)
-            response.raise_for_status()
-            changelog_data = response.json()
-            
             history_records = []
-            if changelog_data and isinstance(changelog_data.get('values'), list):
-                for history in changelog_data['values']:
-                    created = history.get('created')
-                    if not created:
-                        continue
+            if histories is None:
+                histories = self._get_changelog(jira_key, issue_data)
+            for history in histories:
+                created = history.get('created')
+                if not created:
+                    continue
 
-                    for item in history.get('items', []):
-                        field = item.get('field')
-                        history_records.append((
-                            jira_key,
-                            created,
-                            field,
-                            item.get('fromString'),
-                            item.get('toString')
-                        ))
+                for item in history.get('items', []):
+                    field = item.get('field')
+                    history_records.append((
+                        jira_key,
+                        created,
+                        field,
+                        item.get('fromString'),
+                        item.get('toString')
+                    ))
 
-            if history_records:
-                with self.db_conn.cursor() as cursor:
-                    cursor.executemany("""
-                        INSERT INTO jira_history (
-                            jira_key, change_date, field, 
-                            from_value, current_stage
-                        ) VALUES (%s, %s, %s, %s, %s)
-                        ON CONFLICT (jira_key, change_date, field) DO NOTHING
-                    """, history_records)
-                    self.db_conn.commit()
+            self._pending_history.extend(history_records)
+            return True
         except Exception as e:
-            logger.error(f"Failed to store history for {jira_key}: {str(e)}")
-            if self.db_conn:
-                self.db_conn.rollback()
+            logger.error(f"Failed to collect history for {jira_key}: {str(e)}")
+            return False
             
-    def store_jira_details_only(self, jira_key: str) -> int:
+    def store_jira_details_only(self, jira_key: str, issue_data: Optional[Dict] = None) -> int:
         try:
             # Get Jira issue details
-            jira_issue = self._get_jira_issue_details(jira_key)
+            if issue_data is None:
+                issue_data = self._fetch_issue_full(jira_key)
+            jira_issue = self._get_jira_issue_details(jira_key, issue_data) if issue_data else None
             if not jira_issue:
                 logger.error(f"Failed to get details for {jira_key}")
                 return 0
@@ -670,23 +1210,19 @@ class JiraGitHubIntegrator:
             # Try to get description
             issue_description = ""
             try:
-                issue_url = f"{self.jira_config['base_url']}/rest/api/3/issue/{jira_key}?fields=description"
-                response = requests.get(issue_url, auth=self.jira_auth, timeout=10)
-                response.raise_for_status()
-                issue_data = response.json()
                 description_content = issue_data.get('fields', {}).get('description')
                 if isinstance(description_content, dict):
                     issue_description = description_content.get('content', [{}])[0].get('content', [{}])[0].get('text', '')
                 elif isinstance(description_content, str):
                     issue_description = description_content
             except Exception as e:
-                logger.warning(f"Couldn't fetch description for {jira_key}: {str(e)}")
+                logger.warning(f"Couldn't read description for {jira_key}: {str(e)}")
 
             detail_record = (
                 jira_key,
                 jira_issue['priority'],
                 jira_issue['created'],
-                f"{self.jira_config['base_url']}/browse/{jira_key}",
+                self._jira_browse_tpl % jira_key,
                 issue_description[:500],
                 jira_issue['reporter'],
                 jira_issue['issuetype'],
@@ -695,29 +1231,10 @@ class JiraGitHubIntegrator:
                 jira_issue['points'],
                 jira_issue['status_change_date']
             )
+            detail_record += (payload_hash(detail_record),)
 
-            with self.db_conn.cursor() as cursor:
-                try:
-                    cursor.execute("""
-                        INSERT INTO jira_detail (
-                            jira_key, priority, created_date, url, 
-                            summary, reporter, issue_type, project,
-                            resolution, points, status_change_date
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (jira_key) DO UPDATE SET
-                            priority = EXCLUDED.priority,
-                            url = EXCLUDED.url,
-                            summary = EXCLUDED.summary,
-                            reporter = EXCLUDED.reporter,
-                            issue_type = EXCLUDED.issue_type,
-                            resolution = EXCLUDED.resolution,
-                            points = EXCLUDED.points,
-                            status_change_date = EXCLUDED.status_change_date
-                    """, detail_record)
-                except Exception as e:
-                    logger.error(f"Failed to insert jira_detail for {jira_key}: {e}")
-                    return 0
-
+            # Written by the next flush() together with the other queued rows
+            self._pending_details[jira_key] = detail_record
             return 1
 
         except Exception as e:
@@ -726,13 +1243,33 @@ class JiraGitHubIntegrator:
 
     
     def get_changed_files(self, commit_sha: str) -> List[Dict]:
-       
-        url = f"https://api.github.com/repos/{self.github_config['repo']}/commits/{commit_sha}"
+        #Changed files of a commit; commits are immutable, so a cached copy never goes stale
+        key = self._gh_commits_url + "/" + commit_sha
+        cached = self.response_cache.lookup(key, expire_after=float('inf'))
+        if cached:
+            return cached.body
+        files = self._fetch_changed_files(commit_sha)
+        if files is None:
+            return []
+        self.response_cache.store(key, json_dumps(files))
+        return files
+
+    def _fetch_changed_files(self, commit_sha: str) -> Optional[List[Dict]]:
+        #Download the changed files of a commit; None when the request fails
+        url = f"{self._gh_commits_url}/{commit_sha}"
         
         try:
-            response = requests.get(url, headers=self.github_headers)
+            while True:
+                self.github_bucket.acquire()
+                response = self.github_session.get(url)
+                # The session's Retry only covers 429, so 403 rate limits are waited out here
+                delay = rate_limit_delay(response.status_code, response.headers)
+                if delay is None:
+                    break
+                logger.warning(f"GitHub rate limit hit, retrying in {delay:.0f}s")
+                time.sleep(delay)
             response.raise_for_status()
-            commit_data = response.json()
+            commit_data = json_loads(response.content)
             
             return [
                 {
@@ -745,9 +1282,27 @@ class JiraGitHubIntegrator:
                 for file in commit_data.get('files', [])
             ]
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Error fetching commit {commit_sha[:7]}: {e}")
-            return []
+            return None
+
+    def get_changed_files_for_commits(self, commit_shas: List[str]) -> Dict[str, List[Dict]]:
+        #Fetch the changed files of many commits at once; github_bucket paces the requests
+        changed_files = {}
+        missing = []
+        # The SQLite cache belongs to this thread, so only the downloads run in the pool
+        for sha in dict.fromkeys(commit_shas):
+            cached = self.response_cache.lookup(self._gh_commits_url + "/" + sha, expire_after=float('inf'))
+            if cached:
+                changed_files[sha] = cached.body
+            else:
+                missing.append(sha)
+        with ThreadPoolExecutor(max_workers=CHANGED_FILES_WORKERS) as executor:
+            for sha, files in zip(missing, executor.map(self._fetch_changed_files, missing)):
+                if files is not None:
+                    self.response_cache.store(self._gh_commits_url + "/" + sha, json_dumps(files))
+                changed_files[sha] = files or []
+        return {sha: changed_files[sha] for sha in commit_shas}
 
 if __name__ == "__main__":
     try:
@@ -763,18 +1318,13 @@ if __name__ == "__main__":
         
         #calling the get_jira_issues function
         issues = integrator.get_jira_issues(project, start_date, end_date)
-        logger.info(f"Found {len(issues)} Jira issues")
         
-        for issue in issues:
-            jira_key = issue.get('key')
-            if not jira_key:
-                continue
-            integrator.store_single_jira_history(jira_key)  
-            commits = integrator.get_github_commits_for_jira_key(jira_key)
-            integrator.store_jira_details_only(jira_key)
-            if commits and integrator.db_config:
-                stored = integrator.store_commit_jira_mappings(jira_key, commits)
-                logger.info(f"Stored {stored} commits for {jira_key}")        
+        flushed = asyncio.run(integrator.process_issues(issues))
+        flushed = integrator.flush() and flushed
+        integrator.close()
+        if not flushed:
+            logger.error("Some Jira rows were not written to the database")
+            exit(1)
     except Exception as e:
         logger.error(f"Initialization failed: {e}")
         exit(1)
\ No newline at end of file
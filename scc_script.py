@@ -1,31 +1,15 @@
 import subprocess
+import io
 import psycopg2
-import re
 import os
 from datetime import datetime
-import configparser
-from pathlib import Path
 
 # === CONFIGURATION ===
-
-def load_config():
-    config = configparser.ConfigParser()
-    project_config = Path('.github_analyzer_config')
-    if project_config.exists():
-        config.read(project_config)
-        return config
-
-    raise FileNotFoundError("No .github_analyzer_config found in project root or home directory")
 try:
-        config = load_config()
-        GITHUB_TOKEN = config.get('GITHUB', 'TOKEN')
-        DB_CONFIG = {
-            'dbname': config.get('DATABASE', 'NAME'),
-            'user': config.get('DATABASE', 'USER'),
-            'password': config.get('DATABASE', 'PASSWORD'),
-            'host': config.get('DATABASE', 'HOST'),
-            'port': config.get('DATABASE', 'PORT')
-        }
+        # Parsed once per process and shared with the other scripts
+        from config import SETTINGS
+        GITHUB_TOKEN = SETTINGS.github['token']
+        DB_CONFIG = SETTINGS.db_config
 except Exception as e:
         print(f"Config error: {e}")
         exit(1)
@@ -33,47 +17,55 @@ except Exception as e:
 def run_scc(directory):
     print(f"[ℹ️] Running SCC in: {directory}")
     try:
-        result = subprocess.run(
+        # Parse scc's report as it is written instead of buffering the whole stdout
+        with subprocess.Popen(
             ["scc"],
             cwd=directory,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout
+            stdout=subprocess.PIPE,
+            text=True
+        ) as proc:
+            parsed = parse_scc_output(proc.stdout)
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        return parsed
     except Exception as e:
         print("[✘] Error running SCC:", str(e))
         return None
 
-def parse_scc_output(output):
-    lines = output.splitlines()
-
-    # --- Parse language metrics ---
-    start_index = next(i for i, line in enumerate(lines) if line.startswith("Language"))
-    end_index = next(i for i, line in enumerate(lines) if lines[i].startswith("Total"))
-
+def parse_scc_output(lines):
+    # --- Parse language metrics and pick out the cost lines in one pass ---
     language_rows = []
-    for line in lines[start_index+1:end_index]:
-        parts = re.split(r'\s{2,}', line.strip())
-        if len(parts) == 7:
-            language_rows.append({
-                "language": parts[0],
-                "files": int(parts[1]),
-                "lines": int(parts[2]),
-                "blanks": int(parts[3]),
-                "comments": int(parts[4]),
-                "code": int(parts[5]),
-                "complexity": int(parts[6])
-            })
+    cost_line = schedule_line = people_line = None
+    in_languages = seen_languages = False
+    for line in lines:
+        if in_languages:
+            if line.startswith("Total"):
+                in_languages = False
+                continue
+            # Language names may contain spaces, the six numeric columns never do
+            parts = line.rsplit(None, 6)
+            if len(parts) == 7:
+                language_rows.append({
+                    "language": parts[0],
+                    "files": int(parts[1]),
+                    "lines": int(parts[2]),
+                    "blanks": int(parts[3]),
+                    "comments": int(parts[4]),
+                    "code": int(parts[5]),
+                    "complexity": int(parts[6])
+                })
+        elif line.startswith("Language") and not seen_languages:
+            in_languages = seen_languages = True
+        elif cost_line is None and "Estimated Cost to Develop" in line:
+            cost_line = line
+        elif schedule_line is None and "Estimated Schedule Effort" in line:
+            schedule_line = line
+        elif people_line is None and "Estimated People Required" in line:
+            people_line = line
 
-    # --- Parse cost estimates ---
-    cost_line = next((l for l in lines if "Estimated Cost to Develop" in l), None)
-    schedule_line = next((l for l in lines if "Estimated Schedule Effort" in l), None)
-    people_line = next((l for l in lines if "Estimated People Required" in l), None)
-
-    cost = float(re.sub(r'[^\d.]', '', cost_line.split()[-1])) if cost_line else 0.0
-    schedule = float(re.sub(r'[^\d.]', '', schedule_line.split()[4])) if schedule_line else 0.0
-    people = float(re.sub(r'[^\d.]', '', people_line.split()[4])) if people_line else 0.0
+    cost = float(cost_line.rsplit(None, 1)[-1].lstrip('$').replace(',', '')) if cost_line else 0.0
+    schedule = float(schedule_line.split()[4]) if schedule_line else 0.0
+    people = float(people_line.split()[4]) if people_line else 0.0
 
     estimates = {
         "cost_usd": cost,
@@ -84,14 +76,20 @@ def parse_scc_output(output):
     return language_rows, estimates
 
 def insert_language_metrics(rows, conn, scanned_at, directory):
-    cursor = conn.cursor()
+    # COPY text format: tab-separated, with backslashes, tabs and newlines escaped
+    buffer = io.StringIO()
     for row in rows:
-        cursor.execute("""
-            INSERT INTO scc_language_metrics
-            (scanned_at, directory, language, files, lines, blanks, comments, code, complexity)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (scanned_at, directory, row["language"], row["files"], row["lines"],
-              row["blanks"], row["comments"], row["code"], row["complexity"]))
+        values = (scanned_at, directory, row["language"], row["files"], row["lines"],
+                  row["blanks"], row["comments"], row["code"], row["complexity"])
+        buffer.write("\t".join(
+            str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+            for value in values
+        ) + "\n")
+    buffer.seek(0)
+    cursor = conn.cursor()
+    cursor.copy_from(buffer, 'scc_language_metrics', columns=(
+        'scanned_at', 'directory', 'language', 'files', 'lines', 'blanks', 'comments', 'code', 'complexity'
+    ))
     conn.commit()
     cursor.close()
     print(f"[✔] Inserted {len(rows)} language records.")
@@ -109,10 +107,10 @@ def insert_project_estimates(estimates, conn, scanned_at, directory):
 
 if __name__ == "__main__":
     directory = os.getcwd()
-    output = run_scc(directory)
-    if output:
+    parsed = run_scc(directory)
+    if parsed:
         scanned_at = datetime.now()
-        language_data, estimates_data = parse_scc_output(output)
+        language_data, estimates_data = parsed
 
         conn = psycopg2.connect(**DB_CONFIG)
         insert_language_metrics(language_data, conn, scanned_at, directory)